@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from utils.auth import AuthManager
 from utils.email_service import EmailService
 from utils.llm_service import LLMService
+from utils.learning_paths import LearningPathCatalog
 from components.signup import render_signup
 from components.login import render_login
 from components.dashboard import render_dashboard
@@ -39,7 +40,8 @@ def init_services():
     return {
         'auth': AuthManager(),
         'email': EmailService(),
-        'llm': LLMService()
+        'llm': LLMService(),
+        'learning_paths': LearningPathCatalog()
     }
 
 services = init_services()
@@ -0,0 +1,81 @@
+"""
+Per-call latency: fresh agent per call vs the shared OnboardingAgent.
+
+"fresh" builds a new OnboardingAgent (endpoint client, chat wrapper, prompt)
+for every call, which is what Conversational_agent used to do. "shared"
+reuses one agent, as Conversational_agent does now. Both use the same
+memory so only client setup and connection reuse differ. The rule-based
+fast path is disabled so every call reaches the endpoint.
+
+Requires HUGGINGFACEHUB_API_TOKEN (or a logged-in huggingface-cli).
+
+Usage:
+    python benchmarks/agent_runtime.py --calls 20
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from Brain_of_Agent import OnboardingAgent, get_memory
+
+INPUTS = [
+    "Hey, my username is akhil and my password is secure123",
+    "username: maria_lopez password: Welcome2024!",
+    "I'm jordan and I use hunter22 as my password",
+    "login as sam.k with password qwerty789",
+]
+
+
+class _NoFastPath:
+    """Stand-in extractor that never answers, so every run goes through the LLM."""
+
+    def extract(self, text, fields):
+        return {}
+
+    def record(self, hit):
+        pass
+
+
+def llm_only(agent: OnboardingAgent) -> OnboardingAgent:
+    agent.fast_extractor = _NoFastPath()
+    return agent
+
+
+def run(label: str, make_agent, calls: int):
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        make_agent().run(INPUTS[i % len(INPUTS)])
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    print(f"  {label:<7} mean {statistics.mean(latencies):8.1f} ms  "
+          f"p50 {latencies[len(latencies) // 2]:8.1f} ms  "
+          f"p95 {latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]:8.1f} ms")
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    memory = get_memory()
+    memory.search("warm-up")  # keep embedding model load out of the numbers
+
+    shared = llm_only(OnboardingAgent(memory=memory))
+    shared.run(INPUTS[0])  # open the keep-alive connection
+
+    print(f"📊 {args.calls} calls each")
+    fresh_latencies = run("fresh", lambda: llm_only(OnboardingAgent(memory=memory)), args.calls)
+    shared_latencies = run("shared", lambda: shared, args.calls)
+    saved = statistics.mean(fresh_latencies) - statistics.mean(shared_latencies)
+    print(f"\n⏱️ Shared agent saves {saved:.1f} ms per call on average")
+
+
+if __name__ == "__main__":
+    main()
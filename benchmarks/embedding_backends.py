@@ -0,0 +1,102 @@
+"""
+Embedding backend parity check and benchmark.
+
+Compares the quantized ONNX backend against the PyTorch HuggingFace backend:
+- parity: cosine similarity between both embeddings of the same sentence
+- latency: single-query p50/p99
+- throughput: sentences per second when embedding in batches
+
+Usage:
+    python src/embeddings.py                 # export the quantized model once
+    python benchmarks/embedding_backends.py  # run the comparison
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from embeddings import load_embedding_model
+
+SENTENCES = [
+    "How do I get VPN access on my first day?",
+    "Where can I find the employee handbook?",
+    "My username is akhil and my password is secure123",
+    "Who is my onboarding buddy in the Engineering department?",
+    "Please enroll me in the benefits program before Friday.",
+    "What are the core values of the company?",
+    "I need to set up Okta and Figma on my laptop.",
+    "When is the next orientation session scheduled?",
+    "How many vacation days do new hires get?",
+    "Information Security Fundamentals course is required for everyone.",
+]
+
+
+def _unit(vectors):
+    vectors = np.asarray(vectors, dtype="float32")
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def check_parity(reference, candidate, threshold: float):
+    """Return per-sentence cosine similarity and whether all pass the threshold."""
+    ref = _unit(reference.embed_documents(SENTENCES))
+    cand = _unit(candidate.embed_documents(SENTENCES))
+    cosines = (ref * cand).sum(axis=1)
+    return cosines, bool(cosines.min() >= threshold)
+
+
+def measure(model, repeats: int, batch_size: int):
+    """Single-query latency percentiles (ms) and batched throughput (sentences/s)."""
+    model.embed_query(SENTENCES[0])  # warm-up
+
+    latencies = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        model.embed_query(SENTENCES[i % len(SENTENCES)])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    batch = (SENTENCES * (batch_size // len(SENTENCES) + 1))[:batch_size]
+    start = time.perf_counter()
+    for _ in range(max(1, repeats // 10)):
+        model.embed_documents(batch)
+    elapsed = time.perf_counter() - start
+    throughput = batch_size * max(1, repeats // 10) / elapsed
+
+    return {
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "throughput_per_s": throughput,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--threshold", type=float, default=0.99, help="minimum cosine similarity for parity")
+    args = parser.parse_args()
+
+    models = {}
+    for backend in ("huggingface", "onnx"):
+        start = time.perf_counter()
+        models[backend] = load_embedding_model(backend)
+        print(f"⏱️  {backend:<12} load time: {time.perf_counter() - start:.2f}s")
+
+    cosines, ok = check_parity(models["huggingface"], models["onnx"], args.threshold)
+    print(f"\n🎯 Parity: min cosine {cosines.min():.4f}, mean {cosines.mean():.4f} "
+          f"(threshold {args.threshold}) -> {'PASS' if ok else 'FAIL'}")
+
+    print("\n📊 Latency / throughput")
+    for backend, model in models.items():
+        stats = measure(model, args.repeats, args.batch_size)
+        print(f"  {backend:<12} p50 {stats['p50_ms']:7.2f} ms  p99 {stats['p99_ms']:7.2f} ms  "
+              f"{stats['throughput_per_s']:8.1f} sentences/s")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
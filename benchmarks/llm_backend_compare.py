@@ -0,0 +1,128 @@
+"""
+Latency and quality of LLM backends on a fixed prompt set.
+
+Runs the same extraction, short-answer and learning-path prompts through
+LLMService with each backend serving those methods, and reports per
+backend and method:
+  - latency p50/p95 (sequential calls, then one concurrent burst to show
+    what request batching buys),
+  - quality: exact-match field accuracy for extraction, share of expected
+    keywords covered for answers, share of valid learning paths.
+
+The fast-path extractor, caches and handbook are disabled so every call
+reaches the model. Run from the repository root, e.g. after
+`python utils/local_llm.py` has exported the local model:
+    python benchmarks/llm_backend_compare.py --backends local huggingface
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.llm_service import LLMService
+from utils.learning_paths import validate_learning_path
+
+EXTRACTION_SET = [
+    ("Hi! I'm Priya Raman, email priya.raman@acme.io, and I'd like my password to be Sunset#42",
+     {"name": "Priya Raman", "email": "priya.raman@acme.io", "password": "Sunset#42"}),
+    ("name: Tom Becker / mail tom.becker@example.com / pw hunter2!",
+     {"name": "Tom Becker", "email": "tom.becker@example.com", "password": "hunter2!"}),
+    ("This is Ana from sales, reach me at ana.lopez@corp.com. Password should be Blue-Lake-9",
+     {"email": "ana.lopez@corp.com", "password": "Blue-Lake-9"}),
+    ("Please register Chen Wei (chen.wei@startup.dev) with password qwerty-2024",
+     {"name": "Chen Wei", "email": "chen.wei@startup.dev", "password": "qwerty-2024"}),
+]
+
+ANSWER_SET = [
+    ("How do I get VPN access?", ["vpn", "it"]),
+    ("When should I enroll in health benefits?", ["benefits", "enroll"]),
+    ("Who should I talk to about my laptop setup?", ["it", "laptop"]),
+    ("What should I focus on in my first week?", ["team", "week"]),
+]
+
+PATH_SET = [("Software Engineer", "Pro"), ("Account Executive", "Basic"), ("Recruiter", "Enterprise")]
+
+CONTEXT = {"name": "Sam", "role": "Software Engineer", "department": "Engineering", "plan": "Pro"}
+
+
+class _NoFastPath:
+    """Stand-in extractor that never answers, so extraction always uses the model."""
+
+    def extract(self, text, fields):
+        return {}
+
+    def record(self, hit):
+        pass
+
+
+def make_service(backend: str) -> LLMService:
+    methods = ("extract_user_info", "answer_onboarding_question", "suggest_learning_path")
+    llm = LLMService(semantic_cache=False, handbook=False, method_backends={m: backend for m in methods})
+    llm.fast_extractor = _NoFastPath()
+    return llm
+
+
+def cases(llm: LLMService):
+    """(method, call, score(result)) for the whole prompt set."""
+    for text, expected in EXTRACTION_SET:
+        yield "extract_user_info", (lambda t=text: llm.extract_user_info(t)), (
+            lambda result, e=expected: sum(str(result.get(k, "")).strip() == v for k, v in e.items()) / len(e)
+        )
+    for question, keywords in ANSWER_SET:
+        yield "answer_onboarding_question", (lambda q=question: llm.answer_onboarding_question(q, CONTEXT)), (
+            lambda result, k=keywords: sum(word in result.lower() for word in k) / len(k)
+        )
+    for role, plan in PATH_SET:
+        yield "suggest_learning_path", (lambda r=role, p=plan: llm.suggest_learning_path(r, p)), (
+            lambda result: float(validate_learning_path(result) is not None)
+        )
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_backend(backend: str, rounds: int):
+    llm = make_service(backend)
+    timings, scores = {}, {}
+    for _ in range(rounds):
+        llm.invalidate_cache()
+        for method, call, score in cases(llm):
+            start = time.perf_counter()
+            result = call()
+            timings.setdefault(method, []).append(time.perf_counter() - start)
+            scores.setdefault(method, []).append(score(result))
+
+    # One concurrent burst of the whole set: shows the effect of request batching
+    llm.invalidate_cache()
+    burst = list(cases(llm))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(burst)) as pool:
+        list(pool.map(lambda case: case[1](), burst))
+    burst_seconds = time.perf_counter() - start
+    return timings, scores, burst_seconds, len(burst)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["local", "huggingface"])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'backend':<13}{'method':<30}{'p50 s':>8}{'p95 s':>8}{'quality':>9}")
+    for backend in args.backends:
+        timings, scores, burst_seconds, burst_size = run_backend(backend, args.rounds)
+        for method in timings:
+            print(f"{backend:<13}{method:<30}{statistics.median(timings[method]):>8.2f}"
+                  f"{percentile(timings[method], 0.95):>8.2f}{statistics.mean(scores[method]):>9.0%}")
+        print(f"{backend:<13}{f'burst of {burst_size} concurrent calls':<30}{burst_seconds:>8.2f}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Open-loop load test of every LLMService method against the local stand-in.
+
+Requests are issued on a fixed schedule at --qps, cycling through the
+selected methods, whether or not earlier ones have finished, so a slow
+backend shows up as growing latency rather than a lower request rate.
+Latency is measured from each request's scheduled start. Every request
+uses a unique input so the response caches don't hide the backend.
+
+Starts an in-process stand-in unless --url points at a running one.
+Run from the repository root:
+    python benchmarks/llm_load_test.py --qps 20 --duration 30 --ttft-ms 300 --error-rate 0.02
+"""
+
+import os
+import sys
+import time
+import json
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.llm_standin_server import serve, add_profile_arguments, profile_from_args
+
+CONTEXT = {"name": "Sarah", "role": "Software Engineer", "department": "Engineering", "plan": "Pro", "days_active": 2}
+
+
+def drain(stream) -> str:
+    return "".join(stream)
+
+
+def methods(llm, fallback_answer: str) -> dict:
+    """name -> (is_async, call(i), degraded(result)) for every public LLMService method."""
+    welcome_fallback = "Welcome to the team"
+    return {
+        "extract_user_info": (False, lambda i: llm.extract_user_info(f"I'm new here, my username is user{i}"),
+                              lambda r: not r),
+        "generate_personalized_welcome": (False, lambda i: llm.generate_personalized_welcome(
+            f"Hire {i}", "Engineer", "R&D"), lambda r: r.startswith(welcome_fallback)),
+        "stream_personalized_welcome": (False, lambda i: drain(llm.stream_personalized_welcome(
+            f"Hire {i}", "Designer", "Design")), lambda r: r.startswith(welcome_fallback)),
+        "suggest_learning_path": (False, lambda i: llm.suggest_learning_path(f"Role {i}", "Pro"), lambda r: not r),
+        "answer_onboarding_question": (False, lambda i: llm.answer_onboarding_question(
+            f"How do I request VPN access for laptop {i}?", CONTEXT), lambda r: r == fallback_answer),
+        "stream_onboarding_answer": (False, lambda i: drain(llm.stream_onboarding_answer(
+            f"When is benefits enrollment for hire {i}?", CONTEXT)), lambda r: r == fallback_answer),
+        "aextract_user_info": (True, lambda i: llm.aextract_user_info(f"Hi, my username is async{i}"),
+                               lambda r: not r),
+        "agenerate_personalized_welcome": (True, lambda i: llm.agenerate_personalized_welcome(
+            f"Async hire {i}", "Analyst", "Finance"), lambda r: r.startswith(welcome_fallback)),
+        "asuggest_learning_path": (True, lambda i: llm.asuggest_learning_path(f"Async role {i}", "Basic"),
+                                   lambda r: not r),
+        "aanswer_onboarding_question": (True, lambda i: llm.aanswer_onboarding_question(
+            f"Who approves expense report {i}?", CONTEXT), lambda r: r == fallback_answer),
+    }
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--qps", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load")
+    parser.add_argument("--methods", nargs="*", help="Subset of methods (default: all)")
+    parser.add_argument("--url", help="Use a running stand-in instead of starting one")
+    parser.add_argument("--threads", type=int, default=64, help="Worker threads for the blocking methods")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    server = None
+    if args.url is None:
+        server = serve(port=0, profile=profile_from_args(args), background=True)
+        args.url = f"http://127.0.0.1:{server.server_port}"
+    os.environ["LLM_HTTP_URL"] = args.url
+
+    from utils.llm_service import LLMService, ANSWER_FALLBACK
+
+    llm = LLMService(backend="http", semantic_cache=False)
+    table = methods(llm, ANSWER_FALLBACK)
+    selected = args.methods or list(table)
+    results = {name: {"latency": [], "degraded": 0, "errors": 0} for name in selected}
+    lock = threading.Lock()
+
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="load-test-loop", daemon=True).start()
+    pool = ThreadPoolExecutor(max_workers=args.threads)
+
+    def record(name, scheduled, result=None, error=None):
+        elapsed = time.perf_counter() - scheduled
+        degraded = table[name][2]
+        with lock:
+            entry = results[name]
+            entry["latency"].append(elapsed)
+            if error is not None:
+                entry["errors"] += 1
+            elif degraded(result):
+                entry["degraded"] += 1
+
+    def run_sync(name, i, scheduled):
+        try:
+            record(name, scheduled, table[name][1](i))
+        except Exception as e:
+            record(name, scheduled, error=e)
+
+    async def run_async(name, i, scheduled):
+        try:
+            record(name, scheduled, await table[name][1](i))
+        except Exception as e:
+            record(name, scheduled, error=e)
+
+    total = int(args.qps * args.duration)
+    print(f"🚦 {total} requests at {args.qps} QPS over {len(selected)} methods against {args.url}")
+    start = time.perf_counter()
+    futures = []
+    for i in range(total):
+        scheduled = start + i / args.qps
+        time.sleep(max(0.0, scheduled - time.perf_counter()))
+        name = selected[i % len(selected)]
+        if table[name][0]:
+            futures.append(asyncio.run_coroutine_threadsafe(run_async(name, i, scheduled), loop))
+        else:
+            futures.append(pool.submit(run_sync, name, i, scheduled))
+    for future in futures:
+        future.result()
+    wall = time.perf_counter() - start
+    pool.shutdown()
+
+    print(f"\n{'method':<32}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+          f"{'degraded':>10}{'errors':>8}")
+    for name in selected:
+        entry = results[name]
+        ms = [t * 1000 for t in entry["latency"]]
+        print(f"{name:<32}{len(ms):>6}{percentile(ms, 0.5):>10.0f}{percentile(ms, 0.95):>10.0f}"
+              f"{percentile(ms, 0.99):>10.0f}{max(ms, default=float('nan')):>10.0f}"
+              f"{entry['degraded']:>10}{entry['errors']:>8}")
+    everything = [t * 1000 for entry in results.values() for t in entry["latency"]]
+    print(f"\nAll: p50 {percentile(everything, 0.5):.0f} ms, p95 {percentile(everything, 0.95):.0f} ms, "
+          f"p99 {percentile(everything, 0.99):.0f} ms; achieved {total / wall:.1f} QPS")
+    print(f"Structured early stops: {json.dumps(llm.structured_stats())}")
+    print(f"Single-flight: {llm.single_flight.stats()}")
+    print(f"Scheduler: {json.dumps(llm.scheduler.stats())}")
+    print(f"Circuits: {json.dumps(llm.circuit_stats())}")
+    if server is not None:
+        print(f"Stand-in: {dict(server.RequestHandlerClass.stats)}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
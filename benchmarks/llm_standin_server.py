@@ -0,0 +1,177 @@
+"""
+Local stand-in for the hosted LLM, for offline performance testing.
+
+Speaks the protocol of utils.llm_backends.HTTPBackend (POST /v1/generate)
+and simulates a real endpoint: a time-to-first-token delay with jitter,
+a token generation rate, and a share of requests failing with an error
+status. Replies are shaped like real ones (a JSON object for extraction
+prompts, a JSON array for learning paths, prose otherwise) followed by
+chatter, so parsing and early stopping are exercised too.
+
+    python benchmarks/llm_standin_server.py --ttft-ms 300 --tokens-per-second 40 --error-rate 0.02
+    LLM_BACKEND=http streamlit run app.py
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FILLER = ("Welcome aboard! In your first week, focus on meeting your team, setting up your tools and "
+          "reading the employee handbook. Reach out to your manager or onboarding buddy with any questions. "
+          "We are glad to have you here and look forward to your contributions.").split()
+
+
+@dataclass
+class Profile:
+    ttft_ms: float = 300.0          # mean delay before the first token
+    jitter_ms: float = 100.0        # uniform +/- jitter on that delay
+    tokens_per_second: float = 40.0
+    error_rate: float = 0.0         # share of requests answered with `error_status`
+    error_status: int = 503
+    max_tokens: int = 120           # cap on simulated output length
+
+
+def reply_tokens(prompt: str, max_tokens: int) -> list:
+    """Plausible completion for the prompt, split into whitespace-preserving tokens."""
+    if "Extract name, email, password" in prompt:
+        user_input = prompt.rsplit("User Input:", 1)[-1]
+        email = re.search(r"[\w.+-]+@[\w-]+\.[\w.]+", user_input)
+        body = json.dumps({"name": "Alex Morgan", "email": email.group() if email else "alex@example.com",
+                           "password": "changeme123"})
+        text = f"{body}\n\nLet me know if anything else is needed."
+    elif "Return as JSON array" in prompt:
+        items = [{"title": f"Module {n}: Getting started", "description": "Core practices for the role",
+                  "duration": f"{n} hours"} for n in range(1, 6)]
+        text = f"Here are some suggestions:\n{json.dumps(items)}\nGood luck with your onboarding!"
+    else:
+        # Prose runs to the length cap, like a model that uses its whole budget
+        return [word + " " for word in (FILLER * (max_tokens // len(FILLER) + 1))[:max_tokens]]
+    return re.findall(r"\S+\s*", text)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, chunked streaming
+    profile = Profile()
+    stats_lock = threading.Lock()
+    stats = {"requests": 0, "errors": 0, "streams": 0}
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            with self.stats_lock:
+                self._send_json(200, dict(self.stats))
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/v1/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        profile = self.profile
+        with self.stats_lock:
+            self.stats["requests"] += 1
+            self.stats["streams"] += bool(request.get("stream"))
+
+        delay = max(0.0, profile.ttft_ms + random.uniform(-profile.jitter_ms, profile.jitter_ms)) / 1000
+        if random.random() < profile.error_rate:
+            time.sleep(delay / 2)
+            with self.stats_lock:
+                self.stats["errors"] += 1
+            self._send_json(profile.error_status, {"error": "simulated overload"})
+            return
+
+        max_tokens = min(profile.max_tokens, request.get("max_new_tokens", 512))
+        tokens = reply_tokens(request.get("prompt", ""), max_tokens)
+        per_token = 1 / profile.tokens_per_second if profile.tokens_per_second > 0 else 0.0
+        time.sleep(delay)
+
+        if not request.get("stream"):
+            time.sleep(per_token * len(tokens))
+            self._send_json(200, {"text": "".join(tokens)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in tokens:
+                self._write_chunk(json.dumps({"token": token}) + "\n")
+                time.sleep(per_token)
+            self._write_chunk(json.dumps({"done": True}) + "\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # client stopped reading early (e.g. JSON already complete)
+
+    def _write_chunk(self, text: str):
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients closing pooled or abandoned connections is normal under load
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, profile: Profile = None, background: bool = False):
+    """Start the stand-in; with `background` returns the running server (call .shutdown() to stop)."""
+    handler = type("ConfiguredStandInHandler", (StandInHandler,), {
+        "profile": profile or Profile(),
+        "stats": {"requests": 0, "errors": 0, "streams": 0},
+        "stats_lock": threading.Lock(),
+    })
+    server = _QuietServer((host, port), handler)
+    if background:
+        threading.Thread(target=server.serve_forever, name="llm-standin", daemon=True).start()
+        return server
+    print(f"🧪 LLM stand-in listening on http://{host}:{server.server_port}")
+    server.serve_forever()
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--ttft-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--tokens-per-second", type=float, default=40.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--max-tokens", type=int, default=120)
+
+
+def profile_from_args(args) -> Profile:
+    return Profile(args.ttft_ms, args.jitter_ms, args.tokens_per_second, args.error_rate,
+                   args.error_status, args.max_tokens)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    serve(args.host, args.port, profile_from_args(args))
+
+
+if __name__ == "__main__":
+    main()
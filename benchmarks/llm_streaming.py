@@ -0,0 +1,71 @@
+"""
+Time-to-first-token: blocking vs streaming LLMService calls.
+
+For each prompt, measures how long the blocking method takes to return
+(what the user used to wait for behind a spinner) and how long the
+streaming variant takes to yield its first chunk. The response cache is
+cleared before every call so each one reaches the endpoint.
+
+Requires HUGGINGFACEHUB_API_TOKEN. Run from the repository root:
+    python benchmarks/llm_streaming.py --rounds 5
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.llm_service import LLMService
+
+WELCOME_INPUTS = [("Sarah Johnson", "Software Engineer", "Engineering"), ("Luis Ortega", "Account Executive", "Sales")]
+QUESTIONS = ["How do I get VPN access?", "When do I enroll in benefits?", "Who should I ask about my laptop setup?"]
+CONTEXT = {"name": "Sarah", "role": "Software Engineer", "department": "Engineering", "plan": "Pro", "days_active": 2}
+
+
+def first_chunk_seconds(stream) -> float:
+    start = time.perf_counter()
+    next(iter(stream))
+    elapsed = time.perf_counter() - start
+    for _ in stream:  # drain so the request completes normally
+        pass
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    llm = LLMService(semantic_cache=False)
+    results = {"welcome": {"blocking": [], "ttft": []}, "answer": {"blocking": [], "ttft": []}}
+
+    for i in range(args.rounds):
+        name, role, department = WELCOME_INPUTS[i % len(WELCOME_INPUTS)]
+        question = QUESTIONS[i % len(QUESTIONS)]
+
+        llm.invalidate_cache()
+        start = time.perf_counter()
+        llm.generate_personalized_welcome(name, role, department)
+        results["welcome"]["blocking"].append(time.perf_counter() - start)
+        llm.invalidate_cache()
+        results["welcome"]["ttft"].append(first_chunk_seconds(llm.stream_personalized_welcome(name, role, department)))
+
+        llm.invalidate_cache()
+        start = time.perf_counter()
+        llm.answer_onboarding_question(question, CONTEXT)
+        results["answer"]["blocking"].append(time.perf_counter() - start)
+        llm.invalidate_cache()
+        results["answer"]["ttft"].append(first_chunk_seconds(llm.stream_onboarding_answer(question, CONTEXT)))
+
+    print(f"📊 {args.rounds} rounds (median seconds)")
+    for feature, timings in results.items():
+        print(f"  {feature:<8} blocking {statistics.median(timings['blocking']):6.2f}s  "
+              f"first token {statistics.median(timings['ttft']):6.2f}s")
+    print(f"\nLLMService.streaming_stats(): {llm.streaming_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+VectorStore benchmark: recall@k vs latency vs memory.
+
+For each corpus size and index configuration, a fresh process:
+- generates clustered synthetic embeddings and a synthetic text corpus
+- ingests them through VectorStore.add_vectors (FAISS + BM25) in batches
+- rebuilds the index when the configuration needs training (IVF, PQ);
+  until then VectorStore serves those configs with exact search
+- runs single-query searches and measures p50/p99 latency
+- computes recall@k against exact brute-force search
+- records resident memory
+
+Results are written as JSON so runs can be compared; pass --baseline to
+print the change against a previous results file.
+
+Usage:
+    python benchmarks/vector_store_bench.py --sizes 10000 100000 1000000
+    python benchmarks/vector_store_bench.py --sizes 10000 --baseline old.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import multiprocessing as mp
+from datetime import datetime
+
+import numpy as np
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+DIM = 384
+CONFIGS = ["Flat", "HNSW32", "IVF{nlist},Flat", "IVF{nlist},PQ32"]
+VOCABULARY = ["onboarding", "okta", "figma", "vpn", "benefits", "handbook", "policy", "laptop", "mentor",
+              "buddy", "security", "training", "payroll", "slack", "calendar", "goals", "review", "team",
+              "access", "badge", "orientation", "culture", "values", "engineering", "sales", "design"]
+
+
+def synthetic_embeddings(n: int, seed: int, clusters: int = 256) -> np.ndarray:
+    """Unit vectors drawn around random cluster centres, closer to real text embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, DIM)).astype("float32")
+    vectors = centres[rng.integers(0, clusters, n)] + 0.35 * rng.standard_normal((n, DIM)).astype("float32")
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def synthetic_texts(n: int, seed: int, words: int = 12):
+    """Zipf-distributed word salad; each text starts with a unique doc token so hits map back to ids."""
+    rng = np.random.default_rng(seed)
+    ranks = np.minimum(rng.zipf(1.3, (n, words)) - 1, len(VOCABULARY) - 1)
+    return [f"doc{i} " + " ".join(VOCABULARY[r] for r in row) for i, row in enumerate(ranks)]
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (falls back to peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(size: int, config: str, queries: int, top_k: int, batch_size: int) -> dict:
+    """Benchmark one (size, index config) pair. Runs in its own process so memory is isolated."""
+    import faiss
+    from vector_stoe import VectorStore
+
+    nlist = max(16, int(4 * np.sqrt(size)))
+    factory = config.format(nlist=nlist)
+
+    vectors = synthetic_embeddings(size, seed=1)
+    texts = synthetic_texts(size, seed=2)
+    query_vectors = synthetic_embeddings(queries, seed=3)
+    baseline_rss = rss_mb()
+
+    store = VectorStore(dim=DIM, index_factory=factory)
+    start = time.perf_counter()
+    for i in range(0, size, batch_size):
+        store.add_vectors(vectors[i:i + batch_size], texts[i:i + batch_size], wait=False)
+    store.flush()
+    ingest_seconds = time.perf_counter() - start
+
+    build_seconds = 0.0
+    if not faiss.index_factory(DIM, factory).is_trained:
+        start = time.perf_counter()
+        store.rebuild(factory, background=False)
+        build_seconds = time.perf_counter() - start
+
+    exact = faiss.IndexFlatL2(DIM)
+    exact.add(vectors)
+    _, truth = exact.search(query_vectors, top_k)
+    del exact
+
+    latencies, hits = [], 0
+    for q, expected in zip(query_vectors, truth):
+        start = time.perf_counter()
+        results = store.search_vector(q, top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found = {int(text.split(" ", 1)[0][3:]) for text, _ in results}
+        hits += len(found & set(expected.tolist()))
+
+    return {
+        "size": size,
+        "config": factory,
+        "ingest_per_s": size / ingest_seconds,
+        "build_seconds": build_seconds,
+        "search_p50_ms": float(np.percentile(latencies, 50)),
+        "search_p99_ms": float(np.percentile(latencies, 99)),
+        f"recall@{top_k}": hits / (queries * top_k),
+        "rss_mb": rss_mb() - baseline_rss,
+    }
+
+
+def compare(results, baseline_path: str):
+    """Print relative change of each metric against a previous results file."""
+    with open(baseline_path) as f:
+        previous = {(r["size"], r["config"]): r for r in json.load(f)["results"]}
+    print(f"\n📈 Change vs {baseline_path}")
+    for r in results:
+        old = previous.get((r["size"], r["config"]))
+        if not old:
+            continue
+        deltas = []
+        for key, value in r.items():
+            if isinstance(value, float) and old.get(key):
+                deltas.append(f"{key} {100 * (value - old[key]) / old[key]:+.1f}%")
+        print(f"  {r['size']:>8} {r['config']:<18} " + ", ".join(deltas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--configs", nargs="+", default=CONFIGS,
+                        help="faiss index_factory strings; {nlist} is filled in from the corpus size")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--output", default=None, help="results JSON path")
+    parser.add_argument("--baseline", default=None, help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    results = []
+    ctx = mp.get_context("spawn")
+    for size in args.sizes:
+        for config in args.configs:
+            with ctx.Pool(1) as pool:
+                r = pool.apply(run_case, (size, config, args.queries, args.top_k, args.batch_size))
+            results.append(r)
+            print(f"  {r['size']:>8} {r['config']:<18} ingest {r['ingest_per_s']:>10.0f}/s  "
+                  f"build {r['build_seconds']:6.2f}s  p50 {r['search_p50_ms']:7.3f} ms  "
+                  f"p99 {r['search_p99_ms']:7.3f} ms  recall@{args.top_k} {r[f'recall@{args.top_k}']:.3f}  "
+                  f"rss {r['rss_mb']:8.1f} MB")
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "results",
+        f"vector_store_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(),
+            "machine": {"platform": platform.platform(), "cpus": os.cpu_count(), "python": platform.python_version()},
+            "params": {"queries": args.queries, "top_k": args.top_k, "batch_size": args.batch_size},
+            "results": results,
+        }, f, indent=2)
+    print(f"\n✅ Results written to {output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
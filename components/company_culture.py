@@ -1,5 +1,65 @@
 import streamlit as st
 
+# Also indexed by utils.handbook for answering onboarding questions
+COMPANY_VALUES = [
+    {
+        "icon": "🤝",
+        "title": "Collaboration Over Competition",
+        "description": "We believe in the power of teamwork. Success is shared, and we lift each other up.",
+        "behaviors": [
+            "Share knowledge openly",
+            "Ask for help when needed",
+            "Celebrate team wins",
+            "Cross-functional partnerships"
+        ]
+    },
+    {
+        "icon": "🚀",
+        "title": "Innovation & Bold Ideas",
+        "description": "We encourage creative thinking and aren't afraid to challenge the status quo.",
+        "behaviors": [
+            "Experiment and learn from failures",
+            "Question assumptions",
+            "Prototype quickly",
+            "Think long-term"
+        ]
+    },
+    {
+        "icon": "💪",
+        "title": "Ownership & Accountability",
+        "description": "We take responsibility for our work and follow through on commitments.",
+        "behaviors": [
+            "Deliver on promises",
+            "Be proactive",
+            "Learn from mistakes",
+            "Drive projects forward"
+        ]
+    },
+    {
+        "icon": "🌱",
+        "title": "Continuous Growth",
+        "description": "We're committed to personal and professional development for everyone.",
+        "behaviors": [
+            "Seek feedback actively",
+            "Mentor others",
+            "Learn new skills",
+            "Embrace challenges"
+        ]
+    },
+    {
+        "icon": "❤️",
+        "title": "Customer Obsession",
+        "description": "Our customers are at the heart of everything we do.",
+        "behaviors": [
+            "Listen deeply",
+            "Solve real problems",
+            "Go the extra mile",
+            "Think from their perspective"
+        ]
+    }
+]
+
+
 def render_company_culture(user, services):
     """Company culture, values, and social activities"""
     st.title("🌟 Company Culture & Community")
@@ -22,65 +82,7 @@ def render_company_values():
     """Display company values and mission"""
     st.header("Our Core Values")
     
-    values = [
-        {
-            "icon": "🤝",
-            "title": "Collaboration Over Competition",
-            "description": "We believe in the power of teamwork. Success is shared, and we lift each other up.",
-            "behaviors": [
-                "Share knowledge openly",
-                "Ask for help when needed",
-                "Celebrate team wins",
-                "Cross-functional partnerships"
-            ]
-        },
-        {
-            "icon": "🚀",
-            "title": "Innovation & Bold Ideas",
-            "description": "We encourage creative thinking and aren't afraid to challenge the status quo.",
-            "behaviors": [
-                "Experiment and learn from failures",
-                "Question assumptions",
-                "Prototype quickly",
-                "Think long-term"
-            ]
-        },
-        {
-            "icon": "💪",
-            "title": "Ownership & Accountability",
-            "description": "We take responsibility for our work and follow through on commitments.",
-            "behaviors": [
-                "Deliver on promises",
-                "Be proactive",
-                "Learn from mistakes",
-                "Drive projects forward"
-            ]
-        },
-        {
-            "icon": "🌱",
-            "title": "Continuous Growth",
-            "description": "We're committed to personal and professional development for everyone.",
-            "behaviors": [
-                "Seek feedback actively",
-                "Mentor others",
-                "Learn new skills",
-                "Embrace challenges"
-            ]
-        },
-        {
-            "icon": "❤️",
-            "title": "Customer Obsession",
-            "description": "Our customers are at the heart of everything we do.",
-            "behaviors": [
-                "Listen deeply",
-                "Solve real problems",
-                "Go the extra mile",
-                "Think from their perspective"
-            ]
-        }
-    ]
-    
-    for value in values:
+    for value in COMPANY_VALUES:
         with st.expander(f"{value['icon']} {value['title']}", expanded=True):
             st.write(value['description'])
             st.markdown("**How we live this value:**")
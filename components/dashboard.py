@@ -11,6 +11,22 @@ def render_dashboard(user, services):
     Let's make your onboarding smooth and engaging.
     """)
     
+    # Personalized AI welcome: pre-generated for the cohort when available, otherwise
+    # streamed once per session then kept in session state
+    if user.get("personalized_welcome"):
+        st.info(user["personalized_welcome"])
+    elif "personalized_welcome" in st.session_state:
+        st.info(st.session_state.personalized_welcome)
+    elif st.button("✨ Get My Personalized Welcome"):
+        with st.container(border=True):
+            st.session_state.personalized_welcome = st.write_stream(
+                services['llm'].stream_personalized_welcome(
+                    user['name'],
+                    user.get('role', 'Employee'),
+                    user.get('department', 'the team')
+                )
+            )
+    
     # Progress Overview
     st.markdown("---")
     col1, col2, col3, col4 = st.columns(4)
@@ -131,13 +147,13 @@ def render_dashboard(user, services):
         
         if st.form_submit_button("Ask"):
             if question:
-                with st.spinner("Thinking..."):
-                    context = {
-                        "name": user['name'],
-                        "role": user.get('role', ''),
-                        "department": user.get('department', ''),
-                        "plan": user['plan'],
-                        "days_active": days_since_join
-                    }
-                    answer = services['llm'].answer_onboarding_question(question, context)
-                    st.info(f"🤖 **Answer:** {answer}")
\ No newline at end of file
+                context = {
+                    "name": user['name'],
+                    "role": user.get('role', ''),
+                    "department": user.get('department', ''),
+                    "plan": user['plan'],
+                    "days_active": days_since_join
+                }
+                st.markdown("🤖 **Answer:**")
+                # Render tokens as they arrive instead of waiting for the full completion
+                st.write_stream(services['llm'].stream_onboarding_answer(question, context))
\ No newline at end of file
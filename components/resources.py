@@ -1,5 +1,40 @@
 import streamlit as st
 
+# Also indexed by utils.handbook for answering onboarding questions
+POLICY_DOCS = [
+    {
+        "title": "Employee Handbook",
+        "description": "Complete guide to company policies and procedures",
+        "category": "Policy",
+        "pages": 45
+    },
+    {
+        "title": "Benefits Guide",
+        "description": "Overview of health, retirement, and other benefits",
+        "category": "HR",
+        "pages": 20
+    },
+    {
+        "title": "Code of Conduct",
+        "description": "Expected behavior and ethical guidelines",
+        "category": "Policy",
+        "pages": 12
+    },
+    {
+        "title": "IT Usage Policy",
+        "description": "Guidelines for using company technology",
+        "category": "IT",
+        "pages": 8
+    },
+    {
+        "title": "Emergency Procedures",
+        "description": "What to do in case of emergencies",
+        "category": "Safety",
+        "pages": 6
+    },
+]
+
+
 def render_resources(user, services):
     """Render training resources and materials"""
     st.title("📚 Resources & Training")
@@ -80,40 +115,7 @@ def render_resources(user, services):
         st.subheader("Documentation & Policies")
         st.markdown("Important documents and company policies")
         
-        docs = [
-            {
-                "title": "Employee Handbook",
-                "description": "Complete guide to company policies and procedures",
-                "category": "Policy",
-                "pages": 45
-            },
-            {
-                "title": "Benefits Guide",
-                "description": "Overview of health, retirement, and other benefits",
-                "category": "HR",
-                "pages": 20
-            },
-            {
-                "title": "Code of Conduct",
-                "description": "Expected behavior and ethical guidelines",
-                "category": "Policy",
-                "pages": 12
-            },
-            {
-                "title": "IT Usage Policy",
-                "description": "Guidelines for using company technology",
-                "category": "IT",
-                "pages": 8
-            },
-            {
-                "title": "Emergency Procedures",
-                "description": "What to do in case of emergencies",
-                "category": "Safety",
-                "pages": 6
-            },
-        ]
-        
-        for doc in docs:
+        for doc in POLICY_DOCS:
             col1, col2, col3 = st.columns([3, 1, 1])
             with col1:
                 st.markdown(f"**📄 {doc['title']}**")
@@ -189,23 +191,24 @@ def render_resources(user, services):
         
         # AI-generated personalized learning path
         if st.button("🤖 Generate Personalized Learning Path"):
-            with st.spinner("Creating your custom learning path..."):
-                learning_path = services['llm'].suggest_learning_path(
-                    user.get('role', 'Employee'),
-                    user['plan']
-                )
-                
-                if learning_path:
-                    st.success("✨ Here's your personalized learning path!")
-                    for idx, resource in enumerate(learning_path, 1):
-                        st.markdown(f"""
-                        **{idx}. {resource.get('title', 'Resource')}**  
-                        {resource.get('description', '')}  
-                        *Duration: {resource.get('duration', 'N/A')}*
-                        """)
-                        st.markdown("---")
-                else:
-                    st.info("Check back soon for personalized recommendations!")
+            role = user.get('role') or 'Employee'
+            # Precomputed per role/plan offline; only unseen combinations wait on the LLM
+            learning_path = services['learning_paths'].lookup(role, user['plan'])
+            if learning_path is None:
+                with st.spinner("Creating your custom learning path..."):
+                    learning_path = services['llm'].suggest_learning_path(role, user['plan'])
+            
+            if learning_path:
+                st.success("✨ Here's your personalized learning path!")
+                for idx, resource in enumerate(learning_path, 1):
+                    st.markdown(f"""
+                    **{idx}. {resource.get('title', 'Resource')}**  
+                    {resource.get('description', '')}  
+                    *Duration: {resource.get('duration', 'N/A')}*
+                    """)
+                    st.markdown("---")
+            else:
+                st.info("Check back soon for personalized recommendations!")
         
         st.markdown("---")
         st.markdown("### 📌 Quick Links")
@@ -1,87 +1,215 @@
 # app/ai/llm_agent.py
 
+import os
 import re
-import pandas as pd
+import time
+import threading
 from dotenv import load_dotenv
 from langchain_huggingface import HuggingFaceEndpoint, ChatHuggingFace
 from langchain_core.prompts import PromptTemplate
 from parsers import UserLogin
+from fast_extract import FastExtractor
 from vector_stoe import VectorStore
 
 # Load environment variables
 load_dotenv()
 
-# Initialize FAISS memory for storing user inputs
-memory = VectorStore(dim=384)
+# FAISS memory for storing user inputs, built on first use (see get_memory)
+_memory = None
+_memory_lock = threading.Lock()
 
+# Startup timing for time-to-first-request reporting
+_started_at = time.perf_counter()
+_startup_stats = {"warmup_seconds": None, "time_to_first_request": None}
 
-def Conversational_agent(user_input: str):
-    """
-    Conversational AI agent that:
-    1. Stores user input in FAISS memory
-    2. Extracts structured login info using LLM + Pydantic parser
-    """
 
-    # 1️⃣ Store input in FAISS memory
-    memory.add_text(user_input)
+def get_memory() -> VectorStore:
+    """Return the shared FAISS memory, constructing it on first call."""
+    global _memory
+    if _memory is None:
+        with _memory_lock:
+            if _memory is None:
+                # Repeated inputs bump the existing entry instead of crowding top_k
+                _memory = VectorStore(dim=384, dedup_threshold=0.95)
+    return _memory
+
 
-    # 2️⃣ Initialize LLM endpoint
-    llm = HuggingFaceEndpoint(
-    repo_id="mistralai/Mistral-7B-Instruct-v0.3",
-    task="conversational"
+def warm_up(background: bool = True):
+    """
+    Preload the memory, its embedding model and the shared agent so the
+    first request does not pay for them. Runs in a daemon thread unless `background` is False.
+    """
+    def _load():
+        start = time.perf_counter()
+        get_memory().embedding_model.embed_query("warm-up")
+        get_agent()
+        _startup_stats["warmup_seconds"] = time.perf_counter() - start
+
+    if not background:
+        _load()
+        return None
+
+    thread = threading.Thread(target=_load, name="agent-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def startup_report() -> dict:
+    """Warm-up duration and time from import to the first completed request (seconds)."""
+    return dict(_startup_stats)
+
+
+
+# Prompt is built once at import and reused by every call
+LOGIN_PROMPT = PromptTemplate(
+    template=(
+        "You are an intelligent assistant that extracts structured login data.\n"
+        "The user will provide some text, and you must clearly identify their username and password.\n"
+        "Input: {user_input}\n\n"
+        "Return only structured data following this schema:\n"
+        "username: <string>\n"
+        "password: <string>"
+    ),
+    input_variables=["user_input"]
 )
 
 
-    # 3️⃣ Wrap LLM with Chat interface (optional for unified prompt handling)
-    model = ChatHuggingFace(llm=llm)
-
-    # 4️⃣ Create prompt
-    prompt = PromptTemplate(
-        template=(
-            "You are an intelligent assistant that extracts structured login data.\n"
-            "The user will provide some text, and you must clearly identify their username and password.\n"
-            "Input: {user_input}\n\n"
-            "Return only structured data following this schema:\n"
-            "username: <string>\n"
-            "password: <string>"
-        ),
-        input_variables=["user_input"]
-    )
-
-    # 5️⃣ Format prompt with user input
-    formatted_prompt = prompt.format(user_input=user_input)
-
-    # 6️⃣ Invoke LLM and normalize raw response
-    raw_response = model.invoke(formatted_prompt)
-
-    # HuggingFaceEndpoint with task="text-generation" may return dict, str, or message
-    if hasattr(raw_response, "content"):
-        raw_response = raw_response.content
-    elif isinstance(raw_response, dict) and "generated_text" in raw_response:
-        raw_response = raw_response["generated_text"]
-    else:
-        raw_response = str(raw_response)
-
-    # 7️⃣ Try parsing with Pydantic, else fallback to regex
+def _configure_http_pool(pool_size: int):
+    """
+    Give huggingface_hub a keep-alive session with a connection pool sized
+    for concurrent sessions. Newer huggingface_hub releases already share a
+    pooled httpx client and drop configure_http_backend; nothing to do there.
+    """
     try:
-        structured_response = UserLogin.model_validate_json(raw_response)
-    except Exception:
-        username_match = re.search(r"username[:\s]+(\S+)", raw_response, re.IGNORECASE)
-        password_match = re.search(r"password[:\s]+(\S+)", raw_response, re.IGNORECASE)
+        import requests
+        from requests.adapters import HTTPAdapter
+        from huggingface_hub import configure_http_backend
+    except ImportError:
+        return
+
+    def _session_factory():
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    configure_http_backend(backend_factory=_session_factory)
 
-        structured_response = UserLogin(
-            username=username_match.group(1) if username_match else None,
-            password=password_match.group(1) if password_match else None
-        )
 
-    # 8️⃣ Retrieve top 3 similar past inputs from memory
-    recent_history = memory.search(user_input, top_k=3)
+class OnboardingAgent:
+    """
+    Long-lived conversational agent. Owns one LLM client (with pooled
+    keep-alive connections), the prebuilt prompt and the FAISS memory, so
+    calls skip client setup and connection establishment. Holds no
+    per-call state and can be shared across Streamlit sessions.
+    """
+
+    def __init__(self, memory: VectorStore = None, repo_id: str = "mistralai/Mistral-7B-Instruct-v0.3",
+                 pool_size: int = 16):
+        _configure_http_pool(pool_size)
+        self.llm = HuggingFaceEndpoint(repo_id=repo_id, task="conversational")
+        # Chat interface for unified prompt handling
+        self.model = ChatHuggingFace(llm=self.llm)
+        self.prompt = LOGIN_PROMPT
+        self._memory = memory
+        # Rule-based extraction tried before the LLM; fast_extractor.stats() reports its hit rate
+        self.fast_extractor = FastExtractor()
+
+    @property
+    def memory(self) -> VectorStore:
+        return self._memory if self._memory is not None else get_memory()
+
+    def run(self, user_input: str) -> dict:
+        """
+        1. Stores user input in FAISS memory
+        2. Extracts structured login info with the rule-based fast path,
+           falling back to LLM + Pydantic parser
+        """
+
+        # 1️⃣ Store input in FAISS memory
+        memory = self.memory
+        memory.add_text(user_input)
+
+        # 2️⃣ Fast path: unambiguous username + password straight from the text
+        structured_response = None
+        raw_response = None
+        fast = self.fast_extractor.extract(user_input, ("username", "password"))
+        if len(fast) == 2:
+            try:
+                structured_response = UserLogin(**fast)
+            except Exception:
+                structured_response = None
+        self.fast_extractor.record(hit=structured_response is not None)
+
+        if structured_response is None:
+            # 3️⃣ Format prompt with user input and invoke LLM
+            formatted_prompt = self.prompt.format(user_input=user_input)
+            raw_response = self.model.invoke(formatted_prompt)
+
+            # HuggingFaceEndpoint with task="text-generation" may return dict, str, or message
+            if hasattr(raw_response, "content"):
+                raw_response = raw_response.content
+            elif isinstance(raw_response, dict) and "generated_text" in raw_response:
+                raw_response = raw_response["generated_text"]
+            else:
+                raw_response = str(raw_response)
+
+            # 4️⃣ Try parsing with Pydantic, else fallback to regex
+            try:
+                structured_response = UserLogin.model_validate_json(raw_response)
+            except Exception:
+                username_match = re.search(r"username[:\s]+(\S+)", raw_response, re.IGNORECASE)
+                password_match = re.search(r"password[:\s]+(\S+)", raw_response, re.IGNORECASE)
+
+                structured_response = UserLogin(
+                    username=username_match.group(1) if username_match else None,
+                    password=password_match.group(1) if password_match else None
+                )
+
+        # 5️⃣ Retrieve top 3 similar past inputs from memory
+        recent_history = memory.search(user_input, top_k=3)
+
+        if _startup_stats["time_to_first_request"] is None:
+            _startup_stats["time_to_first_request"] = time.perf_counter() - _started_at
+            print(f"⏱️ Time to first request: {_startup_stats['time_to_first_request']:.2f}s")
+
+        return {
+            "structured_response": structured_response,
+            "recent_history": recent_history,
+            "raw_output": raw_response,
+            "fast_path": raw_response is None
+        }
+
+
+_agent = None
+_agent_lock = threading.Lock()
+
+
+def get_agent() -> OnboardingAgent:
+    """Return the process-wide agent, constructing it on first call."""
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                _agent = OnboardingAgent()
+    return _agent
+
+
+def Conversational_agent(user_input: str):
+    """
+    Conversational AI agent that:
+    1. Stores user input in FAISS memory
+    2. Extracts structured login info using LLM + Pydantic parser
+
+    Delegates to the shared OnboardingAgent.
+    """
+    return get_agent().run(user_input)
+
 
-    return {
-        "structured_response": structured_response,
-        "recent_history": recent_history,
-        "raw_output": raw_response
-    }
+# Opt-in background warm-up, e.g. AGENT_WARMUP=1 streamlit run app.py
+if os.getenv("AGENT_WARMUP", "").lower() in ("1", "true", "yes"):
+    warm_up(background=True)
 
 
 # ✅ Example usage
@@ -93,4 +221,7 @@ if __name__ == "__main__":
     print("\n📚 Recent Similar Inputs from Memory:")
     print(output["recent_history"])
     print("\n🧠 Raw Model Output:")
-    print(output["raw_output"])
+    print(output["raw_output"] if not output["fast_path"] else "(fast path, LLM skipped)")
+    print(get_agent().fast_extractor.stats())
+    print("\n⏱️ Startup:")
+    print(startup_report())
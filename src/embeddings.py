@@ -0,0 +1,98 @@
+# app/ai/embeddings.py
+
+import os
+import numpy as np
+from typing import List
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_ONNX_DIR = os.path.join("models", "all-MiniLM-L6-v2-onnx")
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+
+
+class OnnxEmbeddings:
+    """
+    int8-quantized ONNX export of all-MiniLM-L6-v2 run through onnxruntime.
+    Exposes the same embed_query / embed_documents interface as
+    HuggingFaceEmbeddings so it can be dropped into VectorStore.
+    """
+
+    def __init__(self, model_dir: str = DEFAULT_ONNX_DIR, model_file: str = QUANTIZED_MODEL_FILE,
+                 max_length: int = 256, num_threads: int = 0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Tokenize, run the model and mean-pool into unit-length vectors."""
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype="int64")
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype="int64")
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens, then L2-normalize (matches the
+        # Pooling + Normalize modules of the sentence-transformers model)
+        mask = attention_mask[..., None].astype("float32")
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype("float32")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts."""
+        return self._encode(list(texts)).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single text."""
+        return self._encode([text])[0].tolist()
+
+
+def export_quantized_model(output_dir: str = DEFAULT_ONNX_DIR, model_name: str = MODEL_NAME) -> str:
+    """Export the model to ONNX and write a dynamically int8-quantized copy next to it."""
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+
+    quantizer = ORTQuantizer.from_pretrained(output_dir)
+    config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=output_dir, quantization_config=config)
+    return os.path.join(output_dir, QUANTIZED_MODEL_FILE)
+
+
+def load_embedding_model(backend: str = None):
+    """
+    Build the embedding model selected by `backend` or the EMBEDDING_BACKEND
+    env var: "huggingface" (default, PyTorch) or "onnx" (quantized, CPU).
+    """
+    backend = (backend or os.getenv("EMBEDDING_BACKEND", "huggingface")).lower()
+
+    if backend == "onnx":
+        return OnnxEmbeddings(model_dir=os.getenv("ONNX_EMBEDDING_DIR", DEFAULT_ONNX_DIR))
+    if backend == "huggingface":
+        from langchain_huggingface import HuggingFaceEmbeddings
+        return HuggingFaceEmbeddings(model_name=MODEL_NAME)
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+
+if __name__ == "__main__":
+    import sys
+    output = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_ONNX_DIR
+    print(f"✅ Quantized model written to {export_quantized_model(output)}")
@@ -0,0 +1,147 @@
+# app/ai/fast_extract.py
+
+import re
+import threading
+from typing import Dict, Iterable
+
+# Values run to the next whitespace, comma or semicolon (trailing periods handled in _candidates)
+_VALUE = r"([^\s,;\"']+)"
+_NAME = r"([A-Za-z][A-Za-z'\-]*(?:\s+(?!and\b|my\b|with\b|email\b|password\b)[A-Za-z][A-Za-z'\-]*){0,3})"
+
+PATTERNS = {
+    "email": [
+        re.compile(r"\b([A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,})\b"),
+    ],
+    "password": [
+        re.compile(r"\b(?:password|passwd|pwd|pass)\b\s*(?:is|=|:|-)?\s*[\"']?" + _VALUE, re.IGNORECASE),
+        re.compile(r"\buse\s+" + _VALUE + r"\s+as\s+(?:my\s+)?password\b", re.IGNORECASE),
+    ],
+    "username": [
+        re.compile(r"\b(?:username|user\s*name|user|login|handle)\b\s*(?:is|=|:|-)?\s*[\"']?" + _VALUE,
+                   re.IGNORECASE),
+        re.compile(r"\blog\s*in\s+as\s+" + _VALUE, re.IGNORECASE),
+    ],
+    "name": [
+        # Explicit forms only; "I am Senior Engineer", "I'm From Canada", "This is Dr. Jane" go to the LLM
+        re.compile(r"\b(?:my\s+name\s+is|name\s*[:=]|call\s+me)\s+" + _NAME, re.IGNORECASE),
+    ],
+}
+
+# Words the value patterns can capture that are never real values: function words,
+# negations and "not set yet" phrasing ("my password is not decided yet")
+_NOT_VALUES = {
+    "is", "and", "my", "the", "a", "an", "to", "of", "name", "password", "email", "username",
+    "not", "no", "none", "yet", "be", "will", "would", "should", "can", "was", "it", "this", "that",
+    "changed", "change", "set", "decided", "undecided", "tbd", "still", "same", "here", "please",
+    "for", "in", "on", "at", "with", "as", "also", "just", "going", "empty", "blank", "unknown",
+}
+
+# Passwords shorter than this, or made only of letters (a plain word), are left to the LLM
+_MIN_PASSWORD_LENGTH = 6
+
+
+def _candidates(field: str, text: str) -> set:
+    found = set()
+    for pattern in PATTERNS[field]:
+        for match in pattern.finditer(text):
+            value = match.group(1).strip()
+            if field == "name":
+                # "my name is Sam and ..." : keep only the leading capitalized words
+                words = []
+                for word in value.split():
+                    if not word[0].isupper():
+                        break
+                    words.append(word)
+                if words:
+                    found.add(" ".join(words))
+                continue
+            if field == "email":
+                found.add(value)
+                continue
+            if value.lower().rstrip(".") in _NOT_VALUES or "@" in value:
+                continue
+            if field == "password" and not _looks_like_password(value.rstrip(".")):
+                continue
+            if value.endswith("."):
+                # Sentence end or part of the value? Usernames never end in ".", passwords might
+                found.add(value.rstrip("."))
+                if field == "password":
+                    found.add(value)
+            else:
+                found.add(value)
+    return found
+
+
+def _looks_like_password(value: str) -> bool:
+    return len(value) >= _MIN_PASSWORD_LENGTH and not value.isalpha()
+
+
+class FastExtractor:
+    """
+    Rule/grammar-based extractor for name, email, username and password.
+    A field is returned only when exactly one distinct value matches, so
+    results are high-confidence; missing or ambiguous fields are left for
+    the LLM. Tracks how often the fast path alone was enough.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.fast_path_hits = 0
+        self._lock = threading.Lock()
+
+    def extract(self, text: str, fields: Iterable[str]) -> Dict[str, str]:
+        """Return the unambiguous values found for `fields` (possibly a subset)."""
+        result = {}
+        for field in fields:
+            values = _candidates(field, text)
+            if len(values) == 1:
+                result[field] = values.pop()
+        return result
+
+    def record(self, hit: bool):
+        """Count one extraction request and whether the fast path answered it alone."""
+        with self._lock:
+            self.calls += 1
+            if hit:
+                self.fast_path_hits += 1
+
+    def stats(self) -> dict:
+        """Calls seen, fast-path hits and hit rate."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "fast_path_hits": self.fast_path_hits,
+                "hit_rate": self.fast_path_hits / self.calls if self.calls else 0.0,
+            }
+
+
+# Inputs the fast path once got confidently wrong: (text, fields, expected result)
+REGRESSION_CASES = [
+    ("Hello! I'm Priya, priya@corp.com, my password is not decided yet",
+     ("name", "email", "password"), {"email": "priya@corp.com"}),
+    ("I am Excited to start, my email is a@b.co, password is Welcome1",
+     ("name", "email", "password"), {"email": "a@b.co", "password": "Welcome1"}),
+    ("my password will be changed later, name: Tom Becker",
+     ("name", "password"), {"name": "Tom Becker"}),
+    ("I am Keen to learn, password is abc", ("name", "password"), {}),
+    ("I am Senior Engineer at Acme, email e@a.co, password Acme2024!",
+     ("name", "email", "password"), {"email": "e@a.co", "password": "Acme2024!"}),
+    ("I am From Canada, email c@a.co", ("name", "email"), {"email": "c@a.co"}),
+    ("This is Dr. Jane Doe", ("name",), {}),
+    ("My name is Priya Raman and my email is priya@corp.com", ("name", "email"),
+     {"name": "Priya Raman", "email": "priya@corp.com"}),
+    ("name: Tom Becker / call me Tom", ("name",), {}),
+    ("password: sunshine", ("password",), {}),
+]
+
+
+if __name__ == "__main__":
+    extractor = FastExtractor()
+    failures = 0
+    for text, fields, expected in REGRESSION_CASES:
+        got = extractor.extract(text, fields)
+        if got != expected:
+            failures += 1
+            print(f"❌ {text!r}: expected {expected}, got {got}")
+    print(f"✅ {len(REGRESSION_CASES) - failures}/{len(REGRESSION_CASES)} regression cases pass")
+    raise SystemExit(1 if failures else 0)
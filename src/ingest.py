@@ -0,0 +1,260 @@
+# app/ai/ingest.py
+
+"""
+Incremental ingestion of onboarding documents into a VectorStore.
+
+Files (markdown, text, HTML, PDF) are read and chunked in a process pool;
+each chunk is identified by a hash of its text. A manifest next to the
+saved store maps every file to its chunk hashes and row ids, so a re-run
+skips files whose size and mtime are unchanged, re-embeds only chunks
+whose hash is new, and tombstones chunks that disappeared.
+
+    python src/ingest.py docs/ handbook/ --store data/knowledge
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+from vector_stoe import VectorStore
+
+SUPPORTED_EXTENSIONS = {".md", ".markdown", ".txt", ".html", ".htm", ".pdf"}
+MANIFEST_FILE = "manifest.json"
+
+
+class _TextExtractor(HTMLParser):
+    """Visible text of an HTML page, one paragraph per block element."""
+
+    BLOCKS = {"p", "div", "li", "br", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+        elif tag in self.BLOCKS:
+            self.parts.append("\n\n")
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def read_document(path: str) -> str:
+    """Plain text of a supported file."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".pdf":
+        from pypdf import PdfReader
+        return "\n\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+    with open(path, encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    if extension in (".html", ".htm"):
+        extractor = _TextExtractor()
+        extractor.feed(text)
+        text = "".join(extractor.parts)
+    return text
+
+
+def chunk_text(text: str, max_words: int = 200) -> List[str]:
+    """Greedily merge paragraphs into chunks of at most `max_words` words (long paragraphs are split)."""
+    chunks, current, size = [], [], 0
+    for paragraph in text.split("\n\n"):
+        words = paragraph.split()
+        while words:
+            room = max_words - size
+            if room <= 0:
+                chunks.append(" ".join(current))
+                current, size = [], 0
+                continue
+            current.extend(words[:room])
+            size += len(words[:room])
+            words = words[room:]
+        if size >= max_words // 2:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _chunk_file(job: Tuple[str, str, int]) -> Tuple[str, dict, List[Tuple[str, str]], str]:
+    """Worker: (relative path, size/mtime, [(hash, chunk text)], error). Runs in a child process."""
+    path, relative, max_words = job
+    try:
+        stat = os.stat(path)  # taken before reading, so an edit mid-read is picked up next run
+        chunks = [f"[{relative}] {chunk}" for chunk in chunk_text(read_document(path), max_words)]
+        version = {"size": stat.st_size, "mtime": stat.st_mtime}
+        return relative, version, [(chunk_hash(chunk), chunk) for chunk in chunks], None
+    except Exception as e:
+        return relative, None, [], f"{type(e).__name__}: {e}"
+
+
+def discover(roots: List[str]) -> Dict[str, str]:
+    """relative path -> absolute path of every supported file under `roots`."""
+    files = {}
+    for root in roots:
+        root = os.path.abspath(root)
+        if os.path.isfile(root):
+            files[os.path.basename(root)] = root
+            continue
+        for directory, _, names in os.walk(root):
+            for name in names:
+                if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                    path = os.path.join(directory, name)
+                    files[os.path.relpath(path, os.path.dirname(root))] = path
+    return files
+
+
+class Ingestor:
+    """
+    Keeps a saved VectorStore in sync with a set of document folders.
+    Worker processes read and chunk files ahead of the main process, which
+    embeds new chunks in batches of `embed_batch_size` and writes each
+    batch to the store in a single add_vectors call.
+    """
+
+    def __init__(self, store_dir: str, workers: int = None, max_words: int = 200,
+                 embed_batch_size: int = 64, embedding_backend: str = None):
+        self.store_dir = store_dir
+        self.workers = workers or os.cpu_count()
+        self.max_words = max_words
+        self.embed_batch_size = embed_batch_size
+        manifest_path = os.path.join(store_dir, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                self.manifest = json.load(f)
+            self.store = VectorStore.load(store_dir, embedding_backend=embedding_backend)
+        else:
+            self.manifest = {"files": {}}
+            self.store = VectorStore(dim=384, embedding_backend=embedding_backend)
+
+    def run(self, roots: List[str]) -> dict:
+        start = time.perf_counter()
+        files = discover(roots)
+        known = self.manifest["files"]
+        stats = {"files": len(files), "unchanged_files": 0, "changed_files": 0, "removed_files": 0,
+                 "chunks": 0, "embedded": 0, "reused": 0, "deleted": 0, "errors": 0}
+
+        jobs = []
+        for relative, path in files.items():
+            stat = os.stat(path)
+            entry = known.get(relative)
+            if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+                stats["unchanged_files"] += 1
+                stats["chunks"] += len(entry["chunks"])
+                continue
+            jobs.append((path, relative, self.max_words))
+
+        for relative in set(known) - set(files):
+            for _, row_id in known.pop(relative)["chunks"]:
+                self.store.delete(row_id, wait=False)
+                stats["deleted"] += 1
+            stats["removed_files"] += 1
+
+        pending = []   # (relative path, position in its chunk list, text)
+        updated = {}
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for done, (relative, version, chunks, error) in enumerate(pool.map(_chunk_file, jobs, chunksize=4), 1):
+                if error:
+                    print(f"⚠️ Skipping {relative}: {error}")
+                    stats["errors"] += 1
+                else:
+                    stats["changed_files"] += 1
+                    stats["chunks"] += len(chunks)
+                    updated[relative] = dict(version, chunks=self._diff(relative, chunks, pending, stats))
+                if len(pending) >= self.embed_batch_size:
+                    self._embed(pending, updated, stats)
+                    pending = []
+                if done % 25 == 0:
+                    self._progress(done, len(jobs), stats, start)
+        if pending:
+            self._embed(pending, updated, stats)
+        if jobs:
+            self._progress(len(jobs), len(jobs), stats, start)
+
+        self.store.flush()
+        for relative, entry in updated.items():
+            known[relative] = entry
+        self.store.save(self.store_dir)
+        with open(os.path.join(self.store_dir, MANIFEST_FILE), "w") as f:
+            json.dump(self.manifest, f)
+
+        stats["seconds"] = time.perf_counter() - start
+        return stats
+
+    def _diff(self, relative: str, chunks: List[Tuple[str, str]], pending: list, stats: dict) -> list:
+        """[hash, row id] per chunk: unchanged hashes keep their row, new ones are queued, vanished ones tombstoned."""
+        previous = {}
+        for digest, row_id in self.manifest["files"].get(relative, {}).get("chunks", []):
+            previous.setdefault(digest, []).append(row_id)
+
+        rows = []
+        for position, (digest, text) in enumerate(chunks):
+            if previous.get(digest):
+                rows.append([digest, previous[digest].pop()])
+                stats["reused"] += 1
+            else:
+                rows.append([digest, None])
+                pending.append((relative, position, text))
+        for row_ids in previous.values():
+            for row_id in row_ids:
+                self.store.delete(row_id, wait=False)
+                stats["deleted"] += 1
+        return rows
+
+    def _embed(self, pending: list, updated: dict, stats: dict):
+        """Embed queued chunks and write them to the store, filling in their row ids."""
+        for start in range(0, len(pending), self.embed_batch_size):
+            batch = pending[start:start + self.embed_batch_size]
+            texts = [text for _, _, text in batch]
+            vectors = self.store.embedding_model.embed_documents(texts)
+            row_ids = self.store.add_vectors(vectors, texts, wait=True)
+            for (relative, position, _), row_id in zip(batch, row_ids):
+                updated[relative]["chunks"][position][1] = row_id
+            stats["embedded"] += len(batch)
+
+    @staticmethod
+    def _progress(done: int, total: int, stats: dict, start: float):
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        print(f"📄 {done}/{total} changed files | {stats['embedded']} chunks embedded "
+              f"({stats['embedded'] / elapsed:.1f}/s) | {done / elapsed:.1f} files/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Files or folders to ingest")
+    parser.add_argument("--store", default=os.path.join("data", "knowledge"), help="Directory of the saved store")
+    parser.add_argument("--workers", type=int, default=None, help="Chunking processes (default: CPU count)")
+    parser.add_argument("--max-words", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=64, help="Chunks per embedding call")
+    parser.add_argument("--embedding-backend", default=None, help='"huggingface" or "onnx"')
+    args = parser.parse_args()
+
+    ingestor = Ingestor(args.store, workers=args.workers, max_words=args.max_words,
+                        embed_batch_size=args.batch_size, embedding_backend=args.embedding_backend)
+    stats = ingestor.run(args.paths)
+    print(f"✅ {stats['files']} files ({stats['changed_files']} changed, {stats['unchanged_files']} unchanged, "
+          f"{stats['removed_files']} removed): {stats['embedded']} chunks embedded, {stats['reused']} reused, "
+          f"{stats['deleted']} deleted in {stats['seconds']:.1f}s "
+          f"({stats['chunks'] / max(stats['seconds'], 1e-9):.0f} chunks/s)")
+    return 1 if stats["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# app/ai/lexical_index.py
+
+import re
+import math
+from array import array
+from collections import Counter
+import numpy as np
+from typing import List, Tuple
+
+# Keeps tool names and policy IDs intact: "Okta", "SEC-101", "v2.3", "it_usage"
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+
+
+# Function words and question filler ("how do I ...", "what should I ...") that carry no
+# topic; for small corpora where they would otherwise decide the ranking
+STOPWORDS = frozenset("""
+a about after all also am an and any are as at be been before being but by can could did do does
+doing for from get gets getting had has have having he her here hers him his how i if in into is
+it its just me might more most much my need no nor not now of off on once one only or other our
+ours out over own please same she should so some such than that the their theirs them then there
+these they this those through to too up us very was way we were what when where which while who
+whom why will with would you your yours
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokenizer used for both documents and queries."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    Incremental BM25 inverted index. Postings are stored per term as compact
+    typed arrays (doc ids + term frequencies) instead of Python dicts, so
+    memory grows with the number of postings, not Python objects.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, stopwords=None):
+        self.k1 = k1
+        self.b = b
+        # Terms neither indexed nor matched, e.g. STOPWORDS
+        self.stopwords = frozenset(stopwords or ())
+        self.vocab = {}             # term -> term id
+        self._doc_ids = []          # term id -> array('q') of doc ids
+        self._term_freqs = []       # term id -> array('I') of term frequencies
+        self.doc_lengths = array("I")
+        self.num_docs = 0
+        self._total_length = 0
+        self._avg_length = 1.0     # kept current on add so queries never scan every document
+
+    def add(self, doc_id: int, text: str):
+        """Index a document under `doc_id` (ids are expected to be dense row ids)."""
+        self.add_tokens(doc_id, tokenize(text or ""))
+
+    def add_tokens(self, doc_id: int, tokens: List[str]):
+        """add() with the text already tokenized, so callers can tokenize outside their locks."""
+        if self.stopwords:
+            tokens = [token for token in tokens if token not in self.stopwords]
+        if doc_id >= len(self.doc_lengths):
+            self.doc_lengths.extend([0] * (doc_id + 1 - len(self.doc_lengths)))
+        self.doc_lengths[doc_id] = len(tokens)
+        self.num_docs += 1
+        self._total_length += len(tokens)
+        self._avg_length = self._total_length / self.num_docs or 1.0
+
+        for term, tf in Counter(tokens).items():
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                term_id = self.vocab[term] = len(self._doc_ids)
+                self._doc_ids.append(array("q"))
+                self._term_freqs.append(array("I"))
+            self._doc_ids[term_id].append(doc_id)
+            self._term_freqs[term_id].append(tf)
+
+    def query_terms(self, query: str) -> set:
+        """Distinct query terms that can match, stopwords removed."""
+        return set(tokenize(query)) - self.stopwords
+
+    def scores(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(doc ids, BM25 scores) of the docs sharing a query term; cost scales with their postings only."""
+        contributions = []
+        if self.num_docs:
+            for term in self.query_terms(query):
+                term_id = self.vocab.get(term)
+                if term_id is None:
+                    continue
+                # Copies keep the arrays free to grow after we return
+                ids = np.array(self._doc_ids[term_id], dtype="int64")
+                tf = np.array(self._term_freqs[term_id], dtype="float32")
+                lengths = np.frombuffer(self.doc_lengths, dtype=np.uint32)[ids].astype("float32")
+                norm = self.k1 * (1 - self.b + self.b * lengths / self._avg_length)
+                df = len(ids)
+                idf = math.log(1 + (self.num_docs - df + 0.5) / (df + 0.5))
+                contributions.append((ids, idf * tf * (self.k1 + 1) / (tf + norm)))
+        if not contributions:
+            return np.empty(0, dtype="int64"), np.empty(0, dtype="float32")
+        if len(contributions) == 1:
+            return contributions[0]
+        ids, inverse = np.unique(np.concatenate([ids for ids, _ in contributions]), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate([part for _, part in contributions]))
+        return ids, totals.astype("float32")
+
+    def search(self, query: str, top_k: int = 10, exclude=None) -> List[Tuple[int, float]]:
+        """Top-k (doc_id, score) pairs, skipping ids in `exclude`."""
+        ids, scores = self.scores(query)
+        if exclude and len(ids):
+            keep = ~np.isin(ids, np.fromiter(exclude, dtype="int64", count=len(exclude)))
+            ids, scores = ids[keep], scores[keep]
+        if not len(ids):
+            return []
+        if len(ids) > top_k:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            ids, scores = ids[best], scores[best]
+        order = np.argsort(-scores)
+        return [(int(ids[n]), float(scores[n])) for n in order]
@@ -26,3 +26,17 @@ class TaskProgress(BaseModel):
     task_name: str = Field(..., description="The name of the assigned task")
     status: str = Field(..., description="Task status e.g. pending, in_progress, completed")
     remarks: Optional[str] = Field(None, description="Additional comments from the user")
+
+
+# ✅ Schema 4: For onboarding details pulled out of free text (every field optional)
+class UserInfo(BaseModel):
+    name: Optional[str] = Field(None, description="Full name of the new user")
+    email: Optional[EmailStr] = Field(None, description="Email address of the new user")
+    password: Optional[str] = Field(None, description="Password the user asked for")
+
+
+# ✅ Schema 5: For one entry of a suggested learning path
+class LearningResource(BaseModel):
+    title: str = Field(..., description="Name of the course, module or resource")
+    description: str = Field("", description="What the resource covers")
+    duration: str = Field("", description="Expected time to complete, e.g. '45 min'")
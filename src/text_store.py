@@ -0,0 +1,108 @@
+# app/ai/text_store.py
+
+import os
+import mmap
+import threading
+from array import array
+from typing import Iterator, List
+
+
+class TextStore:
+    """
+    Append-only text payload storage: every text is UTF-8 encoded into one
+    contiguous blob and located by an offsets array, so millions of entries
+    cost ~8 bytes of index each instead of a Python str object apiece.
+
+    With `path` set, the blob lives in `path` (read through mmap) and the
+    offsets in `path + ".offsets"`, so an existing store can be reopened;
+    `truncate=True` starts it empty instead. Texts are decoded only when read.
+    """
+
+    def __init__(self, path: str = None, truncate: bool = False):
+        self.path = path
+        self._offsets = array("Q", [0])   # entry i spans blob[offsets[i]:offsets[i + 1]]
+        self._remap_lock = threading.Lock()
+        self._mmap = None
+
+        if path is None:
+            self._blob = bytearray()
+            return
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if truncate:
+            for name in (path, path + ".offsets"):
+                if os.path.exists(name):
+                    os.remove(name)
+        if os.path.exists(path + ".offsets"):
+            with open(path + ".offsets", "rb") as f:
+                self._offsets = array("Q", f.read()) or array("Q", [0])
+        self._blob_file = open(path, "ab+")
+        self._offsets_file = open(path + ".offsets", "ab")
+        if len(self._offsets) == 1 and self._offsets_file.tell() == 0:
+            self._offsets_file.write(self._offsets.tobytes())
+            self._offsets_file.flush()
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def append(self, text: str) -> int:
+        """Store a text and return its position."""
+        self.extend([text])
+        return len(self) - 1
+
+    def extend(self, texts: List[str]):
+        """Store a batch of texts in one write."""
+        encoded = [text.encode("utf-8") for text in texts]
+        end = self._offsets[-1]
+        new_offsets = array("Q")
+        for data in encoded:
+            end += len(data)
+            new_offsets.append(end)
+
+        if self.path is None:
+            self._blob.extend(b"".join(encoded))
+        else:
+            self._blob_file.write(b"".join(encoded))
+            self._blob_file.flush()
+            self._offsets_file.write(new_offsets.tobytes())
+            self._offsets_file.flush()
+        self._offsets.extend(new_offsets)
+
+    def _read(self, start: int, end: int) -> bytes:
+        if start == end:
+            return b""
+        if self.path is None:
+            return bytes(self._blob[start:end])
+        with self._remap_lock:
+            # The file only grows, so remap when a read reaches past the current mapping
+            if self._mmap is None or end > len(self._mmap):
+                if self._mmap is not None:
+                    self._mmap.close()
+                self._mmap = mmap.mmap(self._blob_file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mmap[start:end]
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._read(self._offsets[i], self._offsets[i + 1]).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        # Bound to the length at call time; later appends don't move earlier entries
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the payload blob and offsets."""
+        return self._offsets[-1] + self._offsets.itemsize * len(self._offsets)
+
+    def close(self):
+        """Release file handles of a file-backed store."""
+        if self.path is None:
+            return
+        with self._remap_lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+        self._blob_file.close()
+        self._offsets_file.close()
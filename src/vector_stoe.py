@@ -1,37 +1,510 @@
 # app/ai/vector_store.py
 
+import os
+import json
+import time
+import queue
+import threading
+from array import array
+from collections import deque
+from contextlib import contextmanager
 import faiss
 import numpy as np
-from langchain_huggingface import HuggingFaceEmbeddings
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
+from embeddings import load_embedding_model
+from lexical_index import BM25Index, tokenize
+from text_store import TextStore
+
+
+class _ReadWriteLock:
+    """
+    Readers take no mutex: they register in a deque (append/pop are atomic)
+    and only wait while a writer is inside exclusive(), i.e. while the FAISS
+    and BM25 indexes are being mutated in place (neither can be searched
+    meanwhile). Writers serialize on their own mutex and do everything else
+    (dedup lookups, text writes, tokenizing) while readers keep running.
+    """
+
+    def __init__(self):
+        self._writers = threading.Lock()
+        self._readers = deque()
+        self._mutating = False
+        self._idle = threading.Event()
+        self._idle.set()
+
+    @contextmanager
+    def read(self):
+        while True:
+            self._readers.append(None)
+            if not self._mutating:
+                break
+            self._readers.pop()
+            self._idle.wait()
+        try:
+            yield
+        finally:
+            self._readers.pop()
+
+    @contextmanager
+    def writer(self):
+        """Serialize writers; readers are not blocked."""
+        with self._writers:
+            yield
+
+    @contextmanager
+    def exclusive(self):
+        """With writer() held: wait for in-flight readers, and hold off new ones until done."""
+        self._idle.clear()
+        self._mutating = True
+        try:
+            delay = 0.0
+            while self._readers:
+                time.sleep(delay)
+                delay = min(0.001, delay * 2 or 1e-5)
+            yield
+        finally:
+            self._mutating = False
+            self._idle.set()
+
+    @contextmanager
+    def write(self):
+        with self.writer(), self.exclusive():
+            yield
+
+
+class _PendingWrite:
+    """Queued write; callers can wait on it for the assigned row ids."""
+
+    def __init__(self, op: str, payload, texts=None, dedup_threshold: float = None):
+        self.op = op
+        self.payload = payload
+        self.texts = texts
+        self.dedup_threshold = dedup_threshold
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
 
 
 class VectorStore:
     """
     Simple FAISS-based vector memory to store conversation history
     or previous onboarding-related responses.
+
+    Raw vectors are kept alongside the index so it can be rebuilt online
+    (new index type, retrained IVF quantizer, compaction after deletes)
+    while searches keep hitting the current one.
+
+    Safe to share across threads: embeddings are computed by the caller,
+    writes are queued and applied in batches by a single writer thread,
+    and searches take no lock. They only pause while the writer mutates
+    the FAISS/BM25 indexes in place (see _ReadWriteLock). Rows become
+    visible once they are in the index, and their texts are stored first.
+
+    With a `dedup_threshold` (cosine similarity, assumes normalized
+    embeddings), an add whose nearest stored entry is at least that similar
+    only bumps that entry's last-seen timestamp and hit count.
     """
 
-    def __init__(self, dim: int = 384):
+    def __init__(self, dim: int = 384, embedding_backend: str = None, index_factory: str = "Flat",
+                 nprobe: int = 8, ef_search: int = 64, write_batch_size: int = 256, text_path: str = None,
+                 dedup_threshold: float = None):
         self.dim = dim
-        self.index = faiss.IndexFlatL2(dim)
-        self.text_data = []
-        self.embedding_model = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+        # Any faiss.index_factory string, e.g. "Flat", "IVF256,Flat", "HNSW32", "IVF256,PQ32"
+        self.index_factory = index_factory
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        # Compact UTF-8 blob + offsets; file-backed (mmap) when text_path is given. The path is
+        # working storage that keeps texts out of RAM, not persistence: it is truncated here,
+        # since vectors live in memory. Use save()/load() to keep a store across restarts.
+        self.text_data = TextStore(text_path, truncate=True)
+        self._vectors = np.empty((1024, dim), dtype="float32")
+        self.dedup_threshold = dedup_threshold
+        self.last_seen = array("d")  # per row: unix time of the latest insert or duplicate hit
+        self.hit_counts = array("I")  # per row: how many adds it absorbed, itself included
+        self.duplicates_suppressed = 0
+        self._deleted = set()   # tombstoned row ids
+        self._stale = set()     # tombstoned row ids still present in the index
+        self._lock = _ReadWriteLock()
+        self._rebuild_log = None  # writes arriving while a rebuild runs
+        self.write_batch_size = write_batch_size
+        self._write_queue = queue.Queue()
+        self._writer = None
+        self._writer_start_lock = threading.Lock()
+        self.index = self._build_index(index_factory, np.empty((0, dim), dtype="float32"),
+                                       np.empty(0, dtype="int64"))
+        # BM25 over the same row ids, for exact tokens dense search misses ("Okta", policy IDs)
+        self.lexical_index = BM25Index()
+        # "huggingface" (PyTorch) or "onnx" (int8, CPU); defaults to EMBEDDING_BACKEND
+        self.embedding_backend = embedding_backend
+        self._embedding_model = None
+        self._model_lock = threading.Lock()
+
+    @property
+    def embedding_model(self):
+        """Load the embedding model on first use."""
+        if self._embedding_model is None:
+            with self._model_lock:
+                if self._embedding_model is None:
+                    self._embedding_model = load_embedding_model(self.embedding_backend)
+        return self._embedding_model
+
+    def _build_index(self, index_factory: str, vectors: np.ndarray, ids: np.ndarray):
+        """Create an ID-mapped index, train it on `vectors` if needed and fill it."""
+        base = faiss.index_factory(self.dim, index_factory)
+        if not base.is_trained:
+            try:
+                base.train(vectors)
+            except RuntimeError as e:
+                # Not enough vectors to train the quantizer yet; serve exact search until a rebuild
+                if len(vectors):
+                    print(f"VectorStore: cannot train {index_factory} ({e}); falling back to Flat")
+                base = faiss.IndexFlatL2(self.dim)
+        if hasattr(base, "nprobe"):
+            base.nprobe = self.nprobe
+        if hasattr(base, "hnsw"):
+            base.hnsw.efSearch = self.ef_search
+        index = faiss.IndexIDMap2(base)
+        if len(ids):
+            index.add_with_ids(vectors, ids)
+        return index
+
+    def _append_rows(self, vectors: np.ndarray) -> np.ndarray:
+        """Store raw vectors and return their new row ids. Caller holds the write lock."""
+        start = len(self.text_data)
+        end = start + len(vectors)
+        if end > len(self._vectors):
+            grown = np.empty((max(end, 2 * len(self._vectors)), self.dim), dtype="float32")
+            grown[:start] = self._vectors[:start]
+            self._vectors = grown
+        self._vectors[start:end] = vectors
+        return np.arange(start, end, dtype="int64")
+
+    def _submit(self, write: _PendingWrite, wait: bool):
+        """Queue a write for the writer thread, starting it on first use."""
+        if self._writer is None:
+            with self._writer_start_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._writer_loop, name="vector-store-writer",
+                                                    daemon=True)
+                    self._writer.start()
+        self._write_queue.put(write)
+        return write.wait() if wait else None
+
+    def _writer_loop(self):
+        """Drain the write queue, applying each batch while holding the writer mutex."""
+        while True:
+            batch = [self._write_queue.get()]
+            while len(batch) < self.write_batch_size:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with self._lock.writer():
+                    for write in batch:
+                        try:
+                            self._apply(write)
+                        except Exception as e:
+                            write.error = e
+            finally:
+                for write in batch:
+                    write.done.set()
+                    self._write_queue.task_done()
+
+    def _apply(self, write: _PendingWrite):
+        """Apply one queued write. Runs on the writer thread; readers are excluded only around index mutations."""
+        if write.op == "add":
+            vectors, texts = write.payload, write.texts
+            duplicate_of = [None] * len(texts)
+            if write.dedup_threshold is not None:
+                duplicate_of = self._find_duplicates(vectors, write.dedup_threshold)
+            keep = [n for n, dup in enumerate(duplicate_of) if dup is None]
+
+            # Rows only count once their texts are stored, so the vector copy is scratch until then
+            # and a failing text write leaves the store untouched
+            ids = self._append_rows(vectors[keep])
+            self.text_data.extend([texts[n] for n in keep])
+            now = time.time()
+            try:
+                self.last_seen.extend([now] * len(keep))
+                self.hit_counts.extend([1] * len(keep))
+                tokens = [tokenize(texts[n]) for n in keep]
+                with self._lock.exclusive():
+                    self.index.add_with_ids(vectors[keep], ids)
+                    for row_id, row_tokens in zip(ids.tolist(), tokens):
+                        self.lexical_index.add_tokens(row_id, row_tokens)
+            except Exception:
+                self._tombstone_failed(ids)
+                raise
+            if self._rebuild_log is not None:
+                self._rebuild_log.append(("add", ids))
 
-    def add_text(self, text: str):
-        """Convert text to embedding and add to FAISS index."""
-        vector = self.embedding_model.embed_query(text)
-        vector_np = np.array([vector]).astype("float32")
-        self.index.add(vector_np)
-        self.text_data.append(text)
+            row_of = dict(zip(keep, ids.tolist()))
+            write.result = []
+            for n, dup in enumerate(duplicate_of):
+                if dup is None:
+                    write.result.append(row_of[n])
+                    continue
+                row_id = row_of[dup[1]] if isinstance(dup, tuple) else dup
+                self.last_seen[row_id] = now
+                self.hit_counts[row_id] += 1
+                self.duplicates_suppressed += 1
+                write.result.append(row_id)
+        else:
+            row_id = write.payload
+            if row_id in self._deleted or not 0 <= row_id < len(self.text_data):
+                return
+            with self._lock.exclusive():
+                self._deleted.add(row_id)
+                self._stale.add(row_id)
+            if self._rebuild_log is not None:
+                self._rebuild_log.append(("delete", row_id))
+
+    def _tombstone_failed(self, ids: np.ndarray):
+        """
+        A write failed after its texts were stored. They can't be taken back out of the
+        append-only blob, so tombstone the rows (the next add must not reuse their ids)
+        and pad the per-row arrays so they stay aligned with the texts.
+        """
+        count = len(self.text_data)
+        self.last_seen.extend([0.0] * (count - len(self.last_seen)))
+        self.hit_counts.extend([0] * (count - len(self.hit_counts)))
+        with self._lock.exclusive():
+            self._deleted.update(ids.tolist())
+            self._stale.update(ids.tolist())  # some may have reached the index
+
+    def _find_duplicates(self, vectors: np.ndarray, threshold: float) -> list:
+        """
+        For each vector: the stored row id it near-duplicates (looked up through
+        the index), ("batch", n) if it duplicates earlier entry n of the same
+        batch, or None if it is new.
+        """
+        # Unit vectors: squared L2 distance d relates to cosine as cos = 1 - d / 2
+        max_distance = 2 * (1 - threshold)
+        duplicate_of = [None] * len(vectors)
+        if self.index.ntotal:
+            D, I = self.index.search(vectors, 4 + min(len(self._stale), 60))
+            for n in range(len(vectors)):
+                for distance, row_id in zip(D[n], I[n]):
+                    if row_id >= 0 and row_id not in self._deleted:
+                        if distance <= max_distance:
+                            duplicate_of[n] = int(row_id)
+                        break
+
+        new = []
+        for n, vector in enumerate(vectors):
+            if duplicate_of[n] is not None:
+                continue
+            match = next((k for k in new if ((vectors[k] - vector) ** 2).sum() <= max_distance), None)
+            if match is None:
+                new.append(n)
+            else:
+                duplicate_of[n] = ("batch", match)
+        return duplicate_of
+
+    def add_text(self, text: str, wait: bool = True, dedup_threshold: float = None) -> int:
+        """
+        Convert text to embedding and add to FAISS index. Returns the row id
+        when waiting (the existing row's id if it was a near-duplicate).
+        """
+        ids = self.add_texts([text], wait=wait, dedup_threshold=dedup_threshold)
+        return ids[0] if ids else None
+
+    def add_texts(self, texts: List[str], wait: bool = True, dedup_threshold: float = None) -> List[int]:
+        """Embed a batch of texts and queue them for insertion. Returns row ids when waiting."""
+        if not texts:
+            return []
+        vectors = self.embedding_model.embed_documents(list(texts))
+        return self.add_vectors(vectors, texts, wait=wait, dedup_threshold=dedup_threshold)
+
+    def add_vectors(self, vectors, texts: List[str], wait: bool = True,
+                    dedup_threshold: float = None) -> List[int]:
+        """
+        Queue precomputed embeddings with their texts. Returns row ids when
+        waiting. `dedup_threshold` overrides the store-wide policy for this call.
+        """
+        vectors = np.asarray(vectors, dtype="float32")
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"expected vectors of shape (n, {self.dim}), got {vectors.shape}")
+        if len(vectors) != len(texts):
+            raise ValueError("vectors and texts must have the same length")
+        if not all(isinstance(text, str) for text in texts):
+            raise TypeError("texts must be strings")
+        threshold = self.dedup_threshold if dedup_threshold is None else dedup_threshold
+        return self._submit(_PendingWrite("add", vectors, list(texts), threshold), wait)
+
+    def delete(self, row_id: int, wait: bool = True):
+        """
+        Tombstone an entry; it disappears from results and its vector is
+        compacted out of the index on rebuild (the text payload stays in the
+        append-only blob).
+        """
+        self._submit(_PendingWrite("delete", row_id), wait)
+
+    def flush(self):
+        """Block until every queued write has been applied."""
+        self._write_queue.join()
 
     def search(self, query: str, top_k: int = 3) -> List[Tuple[str, float]]:
         """Search for top-k similar text entries in history."""
+        return self.search_vector(self.embedding_model.embed_query(query), top_k)
+
+    def search_vector(self, vector, top_k: int = 3) -> List[Tuple[str, float]]:
+        """Search with a precomputed query embedding."""
+        query_vec = np.asarray(vector, dtype="float32").reshape(1, self.dim)
+        with self._lock.read():
+            D, I = self.index.search(query_vec, top_k + len(self._stale))
+        # Texts are stored before their rows reach the index and never move, so no lock is needed here
+        results = [(self.text_data[i], float(D[0][idx])) for idx, i in enumerate(I[0])
+                   if i >= 0 and i not in self._deleted]
+        return results[:top_k]
+
+    def hybrid_search(self, query: str, top_k: int = 3, weight: float = 0.5,
+                      rrf_k: int = 60) -> List[Tuple[str, float]]:
+        """
+        Fuse dense and BM25 rankings with reciprocal rank fusion.
+        `weight` is the share given to the dense ranking (1.0 = dense only,
+        0.0 = lexical only). Returns (text, fused score), highest first.
+        """
+        candidates = max(top_k * 4, 20)
         query_vec = np.array([self.embedding_model.embed_query(query)]).astype("float32")
-        D, I = self.index.search(query_vec, top_k)
-        results = [(self.text_data[i], float(D[0][idx])) for idx, i in enumerate(I[0]) if i < len(self.text_data)]
-        return results
+        with self._lock.read():
+            _, I = self.index.search(query_vec, candidates + len(self._stale))
+            dense = [int(i) for i in I[0] if i >= 0 and i not in self._deleted][:candidates]
+            lexical = [i for i, _ in self.lexical_index.search(query, candidates, exclude=self._deleted)]
+
+        fused = {}
+        for rank, row_id in enumerate(dense):
+            fused[row_id] = fused.get(row_id, 0.0) + weight / (rrf_k + rank + 1)
+        for rank, row_id in enumerate(lexical):
+            fused[row_id] = fused.get(row_id, 0.0) + (1 - weight) / (rrf_k + rank + 1)
+
+        best = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(self.text_data[row_id], score) for row_id, score in best]
+
+    def entry_info(self, row_id: int) -> dict:
+        """Text, last-seen time and hit count of a stored entry."""
+        return {
+            "text": self.text_data[row_id],
+            "last_seen": self.last_seen[row_id],
+            "hits": self.hit_counts[row_id],
+            "deleted": row_id in self._deleted,
+        }
+
+    def get_all(self) -> Iterator[str]:
+        """Stream all stored text snippets, decoding one at a time."""
+        # Entries are append-only, so rows below the current count can be read without a lock
+        for row_id in range(len(self.text_data)):
+            if row_id not in self._deleted:
+                yield self.text_data[row_id]
+
+    def save(self, directory: str):
+        """
+        Write vectors, texts, tombstones and hit stats to `directory`.
+        Row ids are preserved, so ids recorded elsewhere stay valid after load().
+        """
+        self.flush()
+        os.makedirs(directory, exist_ok=True)
+        # Holding the writer mutex keeps rows, stats and tombstones consistent; searches continue
+        with self._lock.writer():
+            count = len(self.text_data)
+            texts_path = os.path.join(directory, "texts")
+            texts = TextStore(texts_path + ".tmp", truncate=True)
+            for start in range(0, count, 10_000):
+                texts.extend([self.text_data[i] for i in range(start, min(start + 10_000, count))])
+            texts.close()
+            np.savez(os.path.join(directory, "rows.npz"), vectors=self._vectors[:count],
+                     last_seen=np.array(self.last_seen[:count], dtype="float64"),
+                     hit_counts=np.array(self.hit_counts[:count], dtype="uint32"))
+            meta = {"dim": self.dim, "index_factory": self.index_factory, "count": count,
+                    "deleted": sorted(self._deleted)}
+        for suffix in ("", ".offsets"):
+            os.replace(texts_path + ".tmp" + suffix, texts_path + suffix)
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, directory: str, **kwargs) -> "VectorStore":
+        """Recreate a store written by save(); the index is rebuilt from the stored vectors."""
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        kwargs.setdefault("index_factory", meta["index_factory"])
+        store = cls(dim=meta["dim"], **kwargs)
+
+        rows = np.load(os.path.join(directory, "rows.npz"))
+        texts = TextStore(os.path.join(directory, "texts"))
+        count = meta["count"]
+        with store._lock.write():
+            ids = store._append_rows(rows["vectors"])
+            for start in range(0, count, 10_000):
+                store.text_data.extend([texts[i] for i in range(start, min(start + 10_000, count))])
+            store.last_seen.extend(rows["last_seen"].tolist())
+            store.hit_counts.extend(rows["hit_counts"].tolist())
+            store._deleted = set(meta["deleted"])
+            alive = np.array([i for i in ids.tolist() if i not in store._deleted], dtype="int64")
+            for row_id in alive.tolist():
+                store.lexical_index.add(row_id, store.text_data[row_id])
+            store.index = store._build_index(store.index_factory, store._vectors[alive], alive)
+        texts.close()
+        return store
+
+    def rebuild(self, index_factory: str = None, background: bool = True):
+        """
+        Build a new index from the stored vectors (skipping deleted rows) and
+        swap it in atomically. Writes made during the build are replayed onto
+        the new index before the swap. Returns the worker thread when
+        `background` is True.
+        """
+        with self._lock.write():
+            if self._rebuild_log is not None:
+                raise RuntimeError("A rebuild is already running")
+            factory = index_factory or self.index_factory
+            ids = np.array([i for i in range(len(self.text_data)) if i not in self._deleted], dtype="int64")
+            vectors = self._vectors[ids].copy()
+            self._rebuild_log = []
+
+        def _run():
+            try:
+                new_index = self._build_index(factory, vectors, ids)
+                stale = set()
+
+                # Catch up outside the lock first so the final swap only replays a short tail
+                replayed = self._replay(new_index, stale, 0, locked=False)
+                with self._lock.write():
+                    self._replay(new_index, stale, replayed, locked=True)
+                    self.index = new_index
+                    self.index_factory = factory
+                    self._stale = stale
+            finally:
+                with self._lock.write():
+                    self._rebuild_log = None
+
+        if not background:
+            _run()
+            return None
+        thread = threading.Thread(target=_run, name="vector-store-rebuild", daemon=True)
+        thread.start()
+        return thread
+
+    def _replay(self, index, stale: set, start: int, locked: bool) -> int:
+        """Apply logged writes from position `start` onto `index`; returns the new position."""
+        if not locked:
+            with self._lock.read():
+                pending = self._rebuild_log[start:]
+        else:
+            pending = self._rebuild_log[start:]
 
-    def get_all(self):
-        """Retrieve all stored text snippets."""
-        return self.text_data
+        for op, payload in pending:
+            if op == "add":
+                index.add_with_ids(self._vectors[payload], payload)
+            else:
+                stale.add(payload)
+        return start + len(pending)
@@ -0,0 +1,66 @@
+import random
+import asyncio
+
+# HTTP statuses worth retrying: timeouts, rate limiting, overloaded or restarting endpoints
+TRANSIENT_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+def is_transient(error: Exception) -> bool:
+    """True for timeouts, connection failures and retryable HTTP statuses."""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None) or getattr(error, "status_code", None)
+    return status in TRANSIENT_STATUS
+
+
+async def hedged(attempt, hedge_after: float = None):
+    """
+    Await `attempt()`; if it hasn't finished after `hedge_after` seconds,
+    start a second identical attempt and return whichever succeeds first.
+    The loser is cancelled.
+    """
+    if hedge_after is None:
+        return await attempt()
+
+    tasks = [asyncio.ensure_future(attempt())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            tasks.append(asyncio.ensure_future(attempt()))
+
+        pending = set(tasks)
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def call_with_retries(attempt, deadline: float, retries: int = 3, base_delay: float = 0.5,
+                            max_delay: float = 8.0, hedge_after: float = None):
+    """
+    Run `attempt()` (optionally hedged) until it succeeds, retrying transient
+    errors with full-jitter exponential backoff. `deadline` is an absolute
+    event-loop time covering all attempts and backoff sleeps.
+    """
+    loop = asyncio.get_running_loop()
+    for n in range(retries + 1):
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError("LLM call deadline exceeded")
+        try:
+            return await asyncio.wait_for(hedged(attempt, hedge_after), remaining)
+        except Exception as e:
+            if n == retries or not is_transient(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** n))
+            if loop.time() + delay >= deadline:
+                raise
+            await asyncio.sleep(delay)
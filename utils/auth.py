@@ -70,6 +70,18 @@ class AuthManager:
             return True
         return False
     
+    def update_users(self, updates: Dict[str, Dict]) -> int:
+        """Apply many user updates with a single load/save; returns how many users were found"""
+        users = self.load_users()
+        updated = 0
+        for email, user_data in updates.items():
+            if email in users:
+                users[email].update(user_data)
+                updated += 1
+        if updated:
+            self.save_users(users)
+        return updated
+    
     def get_user(self, email: str) -> Optional[Dict]:
         """Get user by email"""
         users = self.load_users()
@@ -0,0 +1,190 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """The circuit for this method/backend is open; the call was not attempted."""
+
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of recent calls to one method on one backend over
+    `window_seconds`. Once at least `min_calls` are recorded, the circuit
+    opens when the share of errors reaches `failure_rate`, or the share of
+    calls slower than `slow_call_seconds` reaches `slow_rate`. While open,
+    calls are refused at once. After `open_seconds` the circuit goes half
+    open and lets `probes` trial calls through: if they all succeed in
+    time it closes, otherwise it opens again.
+    """
+
+    def __init__(self, name: str, failure_rate: float = 0.5, slow_call_seconds: float = 10.0,
+                 slow_rate: float = 0.8, min_calls: int = 5, window_seconds: float = 30.0,
+                 open_seconds: float = 15.0, probes: int = 1):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate = slow_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.probes = probes
+        self.state = CLOSED
+        self._lock = threading.Lock()
+        self._calls = deque()   # (finished at, failed, slow)
+        self._opened_at = None
+        self._probes_started = 0
+        self._probes_passed = 0
+        self.trips = 0
+        self.rejected = 0
+        self.last_trip_reason = None
+
+    # ---- state changes (caller holds self._lock) ----
+
+    def _transition(self, state: str, reason: str = None):
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            self.trips += 1
+            self.last_trip_reason = reason
+            print(f"⚡ LLM circuit {self.name} open: {reason}")
+        elif state == HALF_OPEN:
+            self._probes_started = 0
+            self._probes_passed = 0
+        else:
+            self._calls.clear()
+            print(f"✅ LLM circuit {self.name} closed")
+
+    def _rates(self):
+        cutoff = time.monotonic() - self.window_seconds
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+        total = len(self._calls)
+        if not total:
+            return 0, 0.0, 0.0
+        failed = sum(1 for _, f, _ in self._calls if f)
+        slow = sum(1 for _, _, s in self._calls if s)
+        return total, failed / total, slow / total
+
+    def _refresh(self):
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+
+    # ---- public API ----
+
+    def is_open(self) -> bool:
+        """True if a call made now would be refused (open, or half open with every probe taken); counted as rejected."""
+        with self._lock:
+            self._refresh()
+            refused = self.state == OPEN or (self.state == HALF_OPEN and self._probes_started >= self.probes)
+            self.rejected += refused
+            return refused
+
+    def allow(self) -> bool:
+        """Reserve the right to call; every True must be followed by record() or release()."""
+        with self._lock:
+            self._refresh()
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and self._probes_started < self.probes:
+                self._probes_started += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, failed: bool, seconds: float):
+        """Outcome of an allowed call."""
+        slow = seconds > self.slow_call_seconds
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if failed or slow:
+                    self._transition(OPEN, "probe " + ("failed" if failed else f"took {seconds:.1f}s"))
+                else:
+                    self._probes_passed += 1
+                    if self._probes_passed >= self.probes:
+                        self._transition(CLOSED)
+                return
+            if self.state == OPEN:
+                return  # a call that started before the circuit opened
+            self._calls.append((time.monotonic(), failed, slow))
+            total, failure_rate, slow_rate = self._rates()
+            if total < self.min_calls:
+                return
+            if failure_rate >= self.failure_rate:
+                self._transition(OPEN, f"{failure_rate:.0%} of {total} recent calls failed")
+            elif slow_rate >= self.slow_rate:
+                self._transition(OPEN, f"{slow_rate:.0%} of {total} recent calls over {self.slow_call_seconds}s")
+
+    def release(self):
+        """An allowed call was abandoned (cancelled, or closed by its consumer) before it finished."""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes_started > self._probes_passed:
+                self._probes_started -= 1
+
+    @contextmanager
+    def guard(self):
+        """Run the enclosed call if allowed (else raise CircuitOpenError) and record how it went."""
+        if not self.allow():
+            raise CircuitOpenError(f"LLM circuit {self.name} is open")
+        start = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.record(True, time.monotonic() - start)
+            raise
+        except BaseException:
+            # Cancelled by a deadline or hedge, or a stream closed early: only slowness is evidence
+            elapsed = time.monotonic() - start
+            if elapsed > self.slow_call_seconds:
+                self.record(False, elapsed)
+            else:
+                self.release()
+            raise
+        self.record(False, time.monotonic() - start)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._refresh()
+            total, failure_rate, slow_rate = self._rates()
+            return {
+                "state": self.state,
+                "recent_calls": total,
+                "failure_rate": failure_rate,
+                "slow_rate": slow_rate,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "last_trip_reason": self.last_trip_reason,
+                "open_for": time.monotonic() - self._opened_at if self.state != CLOSED else 0.0,
+            }
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per (method, backend), created on first use."""
+
+    def __init__(self, slow_call_seconds: dict = None, **settings):
+        self.slow_call_seconds = slow_call_seconds or {}
+        self.settings = settings
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, method: str, backend: str) -> CircuitBreaker:
+        key = (method, backend)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    settings = dict(self.settings)
+                    if method in self.slow_call_seconds:
+                        settings["slow_call_seconds"] = self.slow_call_seconds[method]
+                    breaker = self._breakers[key] = CircuitBreaker(f"{method}/{backend}", **settings)
+        return breaker
+
+    def stats(self) -> dict:
+        """State, recent error/slow rates and trip counts keyed by "method/backend"."""
+        return {breaker.name: breaker.stats() for breaker in list(self._breakers.values())}
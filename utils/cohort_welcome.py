@@ -0,0 +1,141 @@
+"""
+Start-day batch: personalized welcome messages for a whole cohort.
+
+Reads a roster (CSV with a header, or JSON Lines) with email, name, role
+and department columns one row at a time, generates welcomes with bounded
+parallelism through LLMService.agenerate_welcome_batch, and appends each
+success to a checkpoint file. Re-running with the same checkpoint skips
+rows already done, so an interrupted run resumes where it stopped.
+Results are written to the user store in bulk every --flush-every rows.
+
+    python -m utils.cohort_welcome roster.csv --concurrency 16
+"""
+
+import os
+import csv
+import json
+import time
+import asyncio
+import argparse
+from datetime import datetime
+from typing import Dict, Iterator
+from utils.llm_scheduler import priority, BACKGROUND
+
+CHECKPOINT_DIR = os.path.join("data", "checkpoints")
+
+
+def read_roster(path: str) -> Iterator[Dict]:
+    """Stream roster rows from CSV or JSON Lines; rows without an email or name are skipped."""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for row in rows:
+            row = {key.strip().lower(): (value or "").strip() for key, value in row.items() if key}
+            if row.get("email") and row.get("name"):
+                yield row
+
+
+def load_checkpoint(path: str) -> Dict[str, Dict]:
+    """email -> stored result for every row completed by earlier runs."""
+    done = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line from an interrupted write
+                done[record["email"]] = record
+    return done
+
+
+async def run_cohort(llm, auth, roster: str, checkpoint: str, concurrency: int = 8,
+                     flush_every: int = 100, timeout: float = None) -> dict:
+    """Generate, checkpoint and store welcomes for every roster row not already done (as background LLM work)."""
+    completed = load_checkpoint(checkpoint)
+    stats = {"resumed": len(completed), "generated": 0, "failed": 0, "stored": 0, "not_in_store": 0}
+    failures = []
+    # Rows from an earlier run may have been checkpointed but not stored yet; updates are idempotent
+    to_store = {email: _user_update(record) for email, record in completed.items()}
+
+    def flush():
+        if to_store:
+            found = auth.update_users(to_store)
+            stats["stored"] += found
+            stats["not_in_store"] += len(to_store) - found
+            to_store.clear()
+
+    def todo():
+        for row in read_roster(roster):
+            if row["email"] not in completed:
+                completed[row["email"]] = None  # also skips duplicate roster rows
+                yield row
+
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(checkpoint) or ".", exist_ok=True)
+    with open(checkpoint, "a", encoding="utf-8") as out, priority(BACKGROUND):
+        async for person, welcome, error in llm.agenerate_welcome_batch(todo(), concurrency, timeout):
+            if error:
+                stats["failed"] += 1
+                failures.append((person["email"], error))
+                continue
+            record = {"email": person["email"], "welcome": welcome, "generated_at": datetime.now().isoformat()}
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            stats["generated"] += 1
+            to_store[person["email"]] = _user_update(record)
+            if len(to_store) >= flush_every:
+                flush()
+            if stats["generated"] % 50 == 0:
+                _report_progress(stats, start)
+    flush()
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["per_second"] = stats["generated"] / stats["seconds"] if stats["seconds"] else 0.0
+    stats["failures"] = failures
+    return stats
+
+
+def _user_update(record: Dict) -> Dict:
+    return {"personalized_welcome": record["welcome"], "welcome_generated_at": record["generated_at"]}
+
+
+def _report_progress(stats: dict, start: float):
+    elapsed = time.perf_counter() - start
+    print(f"✉️ {stats['generated']} generated, {stats['failed']} failed "
+          f"({stats['generated'] / elapsed:.1f}/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("roster", help="CSV or .jsonl with email, name, role, department")
+    parser.add_argument("--checkpoint", help="Defaults to data/checkpoints/<roster name>.welcome.jsonl")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Generations in flight (calls are also capped by LLM_MAX_IN_FLIGHT)")
+    parser.add_argument("--flush-every", type=int, default=100, help="Rows per bulk user-store write")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-generation deadline in seconds")
+    parser.add_argument("--user-file", default=os.path.join("data", "users.json"))
+    args = parser.parse_args()
+
+    from utils.auth import AuthManager
+    from utils.llm_service import LLMService
+
+    checkpoint = args.checkpoint or os.path.join(
+        CHECKPOINT_DIR, os.path.splitext(os.path.basename(args.roster))[0] + ".welcome.jsonl"
+    )
+    stats = asyncio.run(run_cohort(
+        LLMService(semantic_cache=False), AuthManager(args.user_file), args.roster, checkpoint,
+        args.concurrency, args.flush_every, args.timeout,
+    ))
+    print(f"✅ {stats['generated']} welcomes generated in {stats['seconds']:.1f}s ({stats['per_second']:.1f}/s); "
+          f"{stats['resumed']} resumed from checkpoint, {stats['failed']} failed, "
+          f"{stats['stored']} stored, {stats['not_in_store']} not in the user store")
+    for email, error in stats["failures"][:20]:
+        print(f"⚠️ {email}: {error}")
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
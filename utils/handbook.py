@@ -0,0 +1,145 @@
+import os
+import glob
+import time
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+from src.lexical_index import BM25Index, STOPWORDS, tokenize
+from utils.prompt_context import TokenCounter
+
+# Extra handbook pages (*.md / *.txt); split into paragraph chunks
+HANDBOOK_DIR = os.getenv("HANDBOOK_DIR", os.path.join("data", "handbook"))
+
+
+def _builtin_documents() -> List[Tuple[str, str]]:
+    """(source, text) for the policies and values shown in the app."""
+    from components.resources import POLICY_DOCS
+    from components.company_culture import COMPANY_VALUES
+
+    documents = [
+        (doc["title"], f"{doc['title']} ({doc['category']} policy, {doc['pages']} pages): {doc['description']}.")
+        for doc in POLICY_DOCS
+    ]
+    documents += [
+        (value["title"], f"Company value: {value['title']}. {value['description']} "
+                         f"In practice: {'; '.join(value['behaviors'])}.")
+        for value in COMPANY_VALUES
+    ]
+    return documents
+
+
+class HandbookRetriever:
+    """
+    BM25 retrieval over the company handbook for grounding onboarding
+    answers. Returns the best-scoring chunks that fit in `token_budget`
+    prompt tokens, so grounding never costs more than a fixed slice of the
+    prompt. Stopwords are ignored, and a chunk must score at least
+    `min_score` and share `min_term_overlap` of the question's remaining
+    terms; otherwise nothing is returned, since the answer prompt tells the
+    model to prefer these excerpts. The index is built on first use;
+    retrieval latency is tracked against `slo_ms`.
+    """
+
+    def __init__(self, top_k: int = 3, token_budget: int = 200, chunk_tokens: int = 120,
+                 min_relative_score: float = 0.5, min_score: float = 1.5, min_term_overlap: float = 0.5,
+                 slo_ms: float = 5.0, handbook_dir: str = HANDBOOK_DIR, counter: TokenCounter = None):
+        self.top_k = top_k
+        self.token_budget = token_budget
+        self.chunk_tokens = chunk_tokens
+        # Hits scoring below this fraction of the best hit only matched filler words
+        self.min_relative_score = min_relative_score
+        self.min_score = min_score
+        self.min_term_overlap = min_term_overlap
+        self.slo_ms = slo_ms
+        self.handbook_dir = handbook_dir
+        self.count_tokens = counter or TokenCounter()
+        self._index = None
+        self._chunks = []          # (source, text, tokens)
+        self._chunk_terms = []     # distinct indexed terms per chunk
+        self._lock = threading.Lock()
+        self._latencies_ms = deque(maxlen=1000)
+        self.slo_breaches = 0
+
+    def _file_documents(self) -> List[Tuple[str, str]]:
+        documents = []
+        for path in sorted(glob.glob(os.path.join(self.handbook_dir, "*.md")) +
+                           glob.glob(os.path.join(self.handbook_dir, "*.txt"))):
+            with open(path, encoding="utf-8") as f:
+                documents.append((os.path.basename(path), f.read()))
+        return documents
+
+    def _chunk(self, source: str, text: str):
+        """Merge paragraphs into chunks of about `chunk_tokens` tokens."""
+        current, current_tokens = [], 0
+        for paragraph in (p.strip() for p in text.split("\n\n")):
+            if not paragraph:
+                continue
+            tokens = self.count_tokens(paragraph)
+            if current and current_tokens + tokens > self.chunk_tokens:
+                self._chunks.append((source, "\n".join(current), current_tokens))
+                current, current_tokens = [], 0
+            current.append(paragraph)
+            current_tokens += tokens
+        if current:
+            self._chunks.append((source, "\n".join(current), current_tokens))
+
+    def build(self):
+        """Chunk and index the handbook (called automatically on first retrieve)."""
+        with self._lock:
+            if self._index is not None:
+                return
+            start = time.perf_counter()
+            for source, text in _builtin_documents() + self._file_documents():
+                self._chunk(source, text)
+            index = BM25Index(stopwords=STOPWORDS)
+            for doc_id, (source, text, _) in enumerate(self._chunks):
+                index.add(doc_id, f"{source}\n{text}")
+                self._chunk_terms.append(set(tokenize(f"{source}\n{text}")) - STOPWORDS)
+            self._index = index
+            print(f"📚 Handbook indexed: {len(self._chunks)} chunks in {time.perf_counter() - start:.3f}s")
+
+    def retrieve(self, question: str) -> List[dict]:
+        """Top-k relevant chunks, best first, whose combined size stays within the token budget."""
+        if self._index is None:
+            self.build()
+
+        start = time.perf_counter()
+        selected, used = [], 0
+        terms = self._index.query_terms(question)
+        hits = self._index.search(question, top_k=self.top_k)
+        for doc_id, score in hits:
+            source, text, tokens = self._chunks[doc_id]
+            if score < max(self.min_score, self.min_relative_score * hits[0][1]):
+                break
+            if len(terms & self._chunk_terms[doc_id]) < self.min_term_overlap * len(terms):
+                continue
+            if used + tokens > self.token_budget:
+                continue  # a smaller, lower-ranked chunk may still fit
+            selected.append({"source": source, "text": text, "score": score})
+            used += tokens
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._latencies_ms.append(elapsed_ms)
+        if elapsed_ms > self.slo_ms:
+            self.slo_breaches += 1
+        return selected
+
+    def context_for(self, question: str) -> str:
+        """Retrieved chunks formatted for a prompt; empty when nothing matches."""
+        return "\n".join(f"[{chunk['source']}] {chunk['text']}" for chunk in self.retrieve(question))
+
+    def stats(self) -> dict:
+        """Chunk count and p50/p95 retrieval latency (ms) against the SLO."""
+        ordered = sorted(self._latencies_ms)
+
+        def percentile(q) -> Optional[float]:
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None
+
+        return {
+            "chunks": len(self._chunks),
+            "retrievals": len(ordered),
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "slo_ms": self.slo_ms,
+            "slo_breaches": self.slo_breaches,
+        }
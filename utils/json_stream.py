@@ -0,0 +1,115 @@
+import json
+from pydantic import BaseModel, ValidationError
+from typing import Optional, Type
+
+
+class IncrementalJSONParser:
+    """
+    Consumes streamed text and finds the first top-level JSON object or
+    array in it, tracking nesting and string state character by character.
+    feed() returns True as soon as that value closes, so the caller can stop
+    generation instead of waiting for trailing text. Array items are
+    validated against `item_model` as each one closes; objects are validated
+    against `model` when complete (invalid fields are dropped).
+    """
+
+    def __init__(self, kind: str = "object", model: Optional[Type[BaseModel]] = None,
+                 item_model: Optional[Type[BaseModel]] = None):
+        self.open, self.close = ("{", "}") if kind == "object" else ("[", "]")
+        self.model = model
+        self.item_model = item_model
+        self.items = []           # validated array items so far
+        self.invalid_items = 0
+        self.value = None
+        self.text = None          # the JSON text of the completed value
+        self.done = False
+        self.chunks = 0           # feed() calls, i.e. streamed chunks read
+        self.received = []        # every chunk fed, for completions that never close
+        self._reset()
+
+    def _reset(self):
+        self._buffer = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start = None
+        self.items = []
+        self.invalid_items = 0
+
+    def feed(self, chunk: str) -> bool:
+        """Consume more text; True once the top-level value is complete."""
+        if self.done:
+            return True
+        self.chunks += 1
+        self.received.append(chunk)
+        for ch in chunk:
+            if self._depth == 0:
+                if ch == self.open:
+                    self._buffer = [ch]
+                    self._depth = 1
+                continue
+
+            self._buffer.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 2 and self.open == "[":
+                    self._item_start = len(self._buffer) - 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._item_start is not None:
+                    self._take_item("".join(self._buffer[self._item_start:]))
+                    self._item_start = None
+                elif self._depth == 0 and self._finish():
+                    return True
+        return False
+
+    def _take_item(self, text: str):
+        try:
+            item = json.loads(text)
+            if self.item_model is not None:
+                item = self.item_model.model_validate(item).model_dump()
+            self.items.append(item)
+        except (json.JSONDecodeError, ValidationError):
+            self.invalid_items += 1
+
+    def _finish(self) -> bool:
+        text = "".join(self._buffer)
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            # Bracket in prose ("{name}") rather than real JSON: keep looking
+            self._reset()
+            return False
+
+        if self.open == "[":
+            value = self.items if self.item_model is not None else value
+        elif self.model is not None:
+            value = self._validate_object(value)
+        self.value, self.text, self.done = value, text, True
+        return True
+
+    def _validate_object(self, data: dict) -> dict:
+        try:
+            return self.model.model_validate(data).model_dump(exclude_none=True)
+        except ValidationError as e:
+            invalid = {error["loc"][0] for error in e.errors() if error["loc"]}
+            cleaned = {k: v for k, v in data.items() if k not in invalid}
+            try:
+                return self.model.model_validate(cleaned).model_dump(exclude_none=True)
+            except ValidationError:
+                return {}
+
+
+def parse_json(text: str, kind: str = "object", model=None, item_model=None):
+    """First complete JSON object/array in `text`, validated like IncrementalJSONParser; None if absent."""
+    parser = IncrementalJSONParser(kind, model=model, item_model=item_model)
+    return parser.value if parser.feed(text or "") else None
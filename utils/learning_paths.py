@@ -0,0 +1,168 @@
+"""
+Precomputed learning paths per (role, plan).
+
+suggest_learning_path depends only on the role and plan, so the catalog is
+generated offline for every known combination and the resources page
+reads it instead of calling the LLM. Unseen combinations still go to the
+LLM.
+
+Build or refresh the catalog from the repository root:
+    python -m utils.learning_paths                 # all known roles x plans
+    python -m utils.learning_paths --only-missing  # keep existing entries
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+from typing import Iterable, List, Optional
+from utils.llm_scheduler import priority, BACKGROUND
+
+CATALOG_PATH = os.getenv("LEARNING_PATH_CATALOG", os.path.join("data", "learning_paths.json"))
+
+PLANS = ("Basic", "Pro", "Enterprise")
+
+# Common roles on top of those already present in the user file
+DEFAULT_ROLES = (
+    "Employee", "Software Engineer", "Data Scientist", "Product Manager", "Designer",
+    "Account Executive", "Sales Development Representative", "Marketing Manager",
+    "HR Generalist", "Recruiter", "Financial Analyst", "Operations Manager", "Customer Success Manager",
+)
+
+FIELDS = ("title", "description", "duration")
+
+
+def catalog_key(role: str, plan: str) -> str:
+    """Case- and whitespace-insensitive lookup key."""
+    return f"{' '.join(str(role).split()).lower()}|{str(plan).strip().lower()}"
+
+
+def validate_learning_path(items: list, min_items: int = 3, max_items: int = 8) -> Optional[list]:
+    """Drop untitled and duplicate resources; None if fewer than `min_items` remain."""
+    cleaned, seen = [], set()
+    for item in items or []:
+        title = " ".join(str(item.get("title", "")).split())
+        if not title or title.lower() in seen:
+            continue
+        seen.add(title.lower())
+        cleaned.append({
+            "title": title,
+            "description": " ".join(str(item.get("description", "")).split()),
+            "duration": str(item.get("duration", "")).strip(),
+        })
+    return cleaned[:max_items] if len(cleaned) >= min_items else None
+
+
+class LearningPathCatalog:
+    """Read-only lookup of precomputed learning paths, loaded once from a compact JSON file."""
+
+    def __init__(self, path: str = CATALOG_PATH, load: bool = True):
+        self.path = path
+        self.paths = {}
+        self.generated_at = None
+        self.hits = 0
+        self.misses = 0
+        if load and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            fields = data.get("fields", FIELDS)
+            self.generated_at = data.get("generated_at")
+            self.paths = {
+                key: [dict(zip(fields, row)) for row in rows] for key, rows in data.get("paths", {}).items()
+            }
+
+    def lookup(self, role: str, plan: str) -> Optional[List[dict]]:
+        """Precomputed path for the combination, or None if it was never generated."""
+        path = self.paths.get(catalog_key(role, plan))
+        if path is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return path
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def save(self, path: str = None):
+        """Write the catalog with each resource stored as a [title, description, duration] row."""
+        path = path or self.path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        data = {
+            "generated_at": self.generated_at,
+            "fields": FIELDS,
+            "paths": {key: [[item[f] for f in FIELDS] for item in items] for key, items in sorted(self.paths.items())},
+        }
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+
+
+def known_roles(user_file: str = os.path.join("data", "users.json")) -> List[str]:
+    """DEFAULT_ROLES plus every role found in the user file, deduplicated case-insensitively."""
+    roles = list(DEFAULT_ROLES)
+    if os.path.exists(user_file):
+        with open(user_file) as f:
+            roles += [user.get("role", "") for user in json.load(f).values()]
+    unique = {}
+    for role in roles:
+        role = " ".join(str(role).split())
+        if role:
+            unique.setdefault(role.lower(), role)
+    return sorted(unique.values())
+
+
+async def build_catalog(llm, roles: Iterable[str], plans: Iterable[str] = PLANS,
+                        catalog: LearningPathCatalog = None, only_missing: bool = False) -> dict:
+    """
+    Generate and validate a path for every role/plan combination through
+    the async LLMService API as background work, so its scheduler serves
+    interactive calls first. Invalid outputs are left out of the catalog
+    and reported.
+    """
+    catalog = LearningPathCatalog() if catalog is None else catalog
+    combos = [(role, plan) for role in roles for plan in plans]
+    if only_missing:
+        combos = [(role, plan) for role, plan in combos if catalog_key(role, plan) not in catalog.paths]
+
+    start = time.perf_counter()
+    with priority(BACKGROUND):
+        results = await asyncio.gather(*(llm.asuggest_learning_path(role, plan) for role, plan in combos))
+    invalid = []
+    for (role, plan), items in zip(combos, results):
+        path = validate_learning_path(items)
+        if path is None:
+            invalid.append(f"{role} / {plan}")
+        else:
+            catalog.paths[catalog_key(role, plan)] = path
+    catalog.generated_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+    return {
+        "requested": len(combos),
+        "stored": len(combos) - len(invalid),
+        "invalid": invalid,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--roles", nargs="*", help="Roles to generate (default: known roles)")
+    parser.add_argument("--plans", nargs="*", default=list(PLANS))
+    parser.add_argument("--output", default=CATALOG_PATH)
+    parser.add_argument("--only-missing", action="store_true", help="Keep existing entries, fill in the rest")
+    args = parser.parse_args()
+
+    from utils.llm_service import LLMService
+
+    catalog = LearningPathCatalog(args.output, load=args.only_missing)
+    report = asyncio.run(build_catalog(LLMService(semantic_cache=False), args.roles or known_roles(), args.plans,
+                                       catalog, args.only_missing))
+    catalog.save(args.output)
+    print(f"✅ {report['stored']}/{report['requested']} learning paths generated in {report['seconds']:.1f}s; "
+          f"catalog holds {len(catalog)} entries ({os.path.getsize(args.output)} bytes)")
+    for combo in report["invalid"]:
+        print(f"⚠️ No valid path for {combo}")
+
+
+if __name__ == "__main__":
+    main()
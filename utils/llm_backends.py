@@ -0,0 +1,132 @@
+import os
+import json
+import asyncio
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Iterator
+
+# "huggingface" (hosted endpoint, default), "http" (a server at LLM_HTTP_URL speaking
+# the protocol below, e.g. the stand-in in benchmarks/llm_standin_server.py) or "local"
+# (small quantized model on CPU, see utils/local_llm.py)
+DEFAULT_BACKEND = os.getenv("LLM_BACKEND", "huggingface")
+DEFAULT_HTTP_URL = "http://127.0.0.1:8765"
+
+
+class LLMBackend(ABC):
+    """
+    What LLMService needs from a model: blocking and async calls returning
+    the completion, and sync/async streams of text chunks. Return values
+    may be strings or objects with a `.content` string (LangChain messages).
+    invoke and ainvoke are abstract, so an incomplete backend fails when it
+    is constructed; the streams default to one chunk holding the whole reply.
+    ChatHuggingFace already satisfies this without a wrapper.
+    """
+
+    @abstractmethod
+    def invoke(self, prompt: str):
+        ...
+
+    def stream(self, prompt: str) -> Iterator:
+        yield self.invoke(prompt)
+
+    @abstractmethod
+    async def ainvoke(self, prompt: str):
+        ...
+
+    async def astream(self, prompt: str) -> AsyncIterator:
+        yield await self.ainvoke(prompt)
+
+
+class HTTPBackend(LLMBackend):
+    """
+    Client for a minimal generation API: POST {url}/v1/generate with
+    {"prompt", "max_new_tokens", "temperature", "stream"}. Blocking calls get
+    {"text": ...}; streaming calls read NDJSON lines {"token": ...} until
+    {"done": true}. Error statuses raise httpx.HTTPStatusError, which the
+    async retry logic classifies by status code.
+    """
+
+    def __init__(self, url: str = None, max_new_tokens: int = 512, temperature: float = 0.3,
+                 timeout: float = 60.0, pool_size: int = 32):
+        import httpx
+
+        url = url or os.getenv("LLM_HTTP_URL", DEFAULT_HTTP_URL)
+        self.url = url.rstrip("/") + "/v1/generate"
+        self.params = {"max_new_tokens": max_new_tokens, "temperature": temperature}
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self._client = httpx.Client(timeout=timeout, limits=limits)
+        self._async_clients = {}   # event loop -> AsyncClient (clients are bound to their loop)
+        self._timeout = timeout
+        self._limits = limits
+
+    def _body(self, prompt: str, stream: bool) -> dict:
+        return {"prompt": prompt, "stream": stream, **self.params}
+
+    def _async_client(self):
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = httpx.AsyncClient(timeout=self._timeout, limits=self._limits)
+        return client
+
+    def invoke(self, prompt: str) -> str:
+        response = self._client.post(self.url, json=self._body(prompt, False))
+        response.raise_for_status()
+        return response.json()["text"]
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        with self._client.stream("POST", self.url, json=self._body(prompt, True)) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event.get("done"):
+                    return
+                yield event["token"]
+
+    async def ainvoke(self, prompt: str) -> str:
+        response = await self._async_client().post(self.url, json=self._body(prompt, False))
+        response.raise_for_status()
+        return response.json()["text"]
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        async with self._async_client().stream("POST", self.url, json=self._body(prompt, True)) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event.get("done"):
+                    return
+                yield event["token"]
+
+
+def parse_method_backends(spec: str) -> dict:
+    """ "extract_user_info=local,answer_onboarding_question=local" -> {method: backend} """
+    pairs = (item.split("=", 1) for item in spec.split(",") if "=" in item)
+    return {method.strip(): backend.strip().lower() for method, backend in pairs}
+
+
+def load_backend(backend: str = None, model_params: dict = None):
+    """
+    Build the chat backend selected by `backend` or the LLM_BACKEND env var.
+    `model_params` are the HuggingFaceEndpoint arguments; the HTTP backend
+    reuses the generation settings among them.
+    """
+    backend = (backend or DEFAULT_BACKEND).lower()
+    model_params = model_params or {}
+
+    if backend == "huggingface":
+        from langchain_huggingface import HuggingFaceEndpoint, ChatHuggingFace
+        return ChatHuggingFace(llm=HuggingFaceEndpoint(**model_params))
+    if backend == "http":
+        return HTTPBackend(
+            max_new_tokens=model_params.get("max_new_tokens", 512),
+            temperature=model_params.get("temperature", 0.3),
+        )
+    if backend == "local":
+        from utils.local_llm import LocalBackend
+        return LocalBackend()
+    raise ValueError(f"Unknown LLM backend: {backend}")
@@ -0,0 +1,133 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+MISS = object()
+
+
+class ResponseCache:
+    """
+    Two-tier cache for LLM responses: an in-memory LRU in front of an
+    optional SQLite file. Entries are keyed by method, normalized prompt and
+    model parameters, expire after a per-method TTL, and can be invalidated
+    per key, per method or entirely. A TTL of 0 disables caching for that
+    method (e.g. prompts containing passwords). Expired entries stay until
+    evicted so they can still be served, marked stale, when the model is
+    unavailable.
+    """
+
+    def __init__(self, max_entries: int = 512, db_path: Optional[str] = None,
+                 ttls: Optional[Dict[str, float]] = None, default_ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()   # key -> (method, expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, method TEXT, value TEXT, expires_at REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_method ON llm_cache (method)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(method: str, prompt: str, params: dict) -> str:
+        """Stable key from method, whitespace-normalized prompt and model parameters."""
+        normalized = " ".join(prompt.split())
+        payload = json.dumps({"method": method, "prompt": normalized, "params": params}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ttl(self, method: str) -> float:
+        return self.ttls.get(method, self.default_ttl)
+
+    def get(self, method: str, key: str, stale: bool = False):
+        """Cached value or MISS; with stale=True, expired entries are returned too."""
+        if not self.ttl(method):
+            return MISS
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (stale or entry[1] > now):
+                self._entries.move_to_end(key)
+                self._count_hit(entry[1] <= now)
+                return entry[2]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and (stale or row[1] > now):
+                    value = json.loads(row[0])
+                    self._remember(key, method, row[1], value)
+                    self._count_hit(row[1] <= now)
+                    return value
+
+            self.misses += 1
+            return MISS
+
+    def _count_hit(self, expired: bool):
+        if expired:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+
+    def set(self, method: str, key: str, value):
+        """Store a JSON-serializable value for the method's TTL."""
+        ttl = self.ttl(method)
+        if not ttl:
+            return
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, method, expires_at, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, method, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, method, json.dumps(value), expires_at),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, method: str, expires_at: float, value):
+        self._entries[key] = (method, expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, method: Optional[str] = None, key: Optional[str] = None):
+        """Drop one key, every entry of a method, or everything when called without arguments."""
+        with self._lock:
+            if key is not None:
+                self._entries.pop(key, None)
+                where, args = "key = ?", (key,)
+            elif method is not None:
+                for k in [k for k, entry in self._entries.items() if entry[0] == method]:
+                    del self._entries[k]
+                where, args = "method = ?", (method,)
+            else:
+                self._entries.clear()
+                where, args = "1 = 1", ()
+
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM llm_cache WHERE {where}", args)
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,254 @@
+import time
+import asyncio
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+POLL_SECONDS = 1.0   # how often waiters re-check whether held-back work may start
+
+# Callers mark batch work with `with priority(BACKGROUND):`; everything else is interactive.
+# Context variables follow asyncio tasks, so one mark around asyncio.run() covers a whole job.
+_priority = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority(name: str):
+    """Run the enclosed LLM calls in priority class `name`."""
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+class SchedulerRejected(Exception):
+    """Request refused by admission control (queue full, or background shed under load)."""
+
+
+class _Waiter:
+    """A queued request; woken from whichever thread frees a slot."""
+
+    def __init__(self, cls: str, tag: float, loop=None):
+        self.cls = cls
+        self.tag = tag
+        self.enqueued = time.monotonic()
+        self.loop = loop
+        self.granted = False
+        if loop is None:
+            self._event = threading.Event()
+        else:
+            self._future = loop.create_future()
+
+    def wake(self):
+        self.granted = True
+        if self.loop is None:
+            self._event.set()
+        else:
+            self.loop.call_soon_threadsafe(lambda: self._future.done() or self._future.set_result(None))
+
+
+class PriorityScheduler:
+    """
+    Admits LLM calls into `capacity` concurrent slots shared by all threads
+    and event loops. Waiting requests are dispatched by weighted fair
+    queuing across priority classes: each request gets a virtual finish
+    tag advanced by 1/weight of its class, and the smallest tag goes
+    next, so interactive traffic gets `weights` times the throughput of
+    background traffic when both are queued, without starving either.
+
+    Admission control: a class whose queue holds `max_queue` requests
+    rejects new ones. When the recent p95 latency of interactive calls
+    (queue wait included) exceeds `interactive_p95_threshold` seconds,
+    background requests are shed immediately (`shed_background=True`) or
+    held in their queue until the p95 recovers.
+    """
+
+    def __init__(self, capacity: int = 8, weights: dict = None, max_queue: dict = None,
+                 interactive_p95_threshold: float = None, shed_background: bool = False,
+                 window_seconds: float = 60.0):
+        self.capacity = capacity
+        self.weights = weights or {INTERACTIVE: 8.0, BACKGROUND: 1.0}
+        self.max_queue = max_queue or {INTERACTIVE: 256, BACKGROUND: 10_000}
+        self.interactive_p95_threshold = interactive_p95_threshold
+        self.shed_background = shed_background
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._queues = {cls: deque() for cls in self.weights}
+        self._last_tag = {cls: 0.0 for cls in self.weights}
+        self._virtual_time = 0.0
+        self._latencies = {cls: deque() for cls in self.weights}   # (finished at, seconds)
+        self._waits = {cls: deque(maxlen=1000) for cls in self.weights}
+        self._counts = {cls: {"admitted": 0, "rejected": 0, "completed": 0, "in_flight": 0} for cls in self.weights}
+
+    # ---- admission and dispatch (caller holds self._lock) ----
+
+    def _cls(self, cls: str) -> str:
+        return cls if cls in self.weights else INTERACTIVE
+
+    def _p95(self, cls: str):
+        window = self._latencies[cls]
+        cutoff = time.monotonic() - self.window_seconds
+        while window and window[0][0] < cutoff:
+            window.popleft()
+        if not window:
+            return None
+        ordered = sorted(seconds for _, seconds in window)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def _overloaded(self) -> bool:
+        if self.interactive_p95_threshold is None:
+            return False
+        p95 = self._p95(INTERACTIVE)
+        return p95 is not None and p95 > self.interactive_p95_threshold
+
+    def _eligible(self, cls: str, overloaded: bool) -> bool:
+        return not (overloaded and cls == BACKGROUND)
+
+    def _admit(self, cls: str, loop=None):
+        """Take a slot now (returns None) or enqueue and return a waiter."""
+        overloaded = self._overloaded()
+        if cls == BACKGROUND and overloaded and self.shed_background:
+            self._counts[cls]["rejected"] += 1
+            raise SchedulerRejected("background LLM request shed: interactive p95 above threshold")
+        if len(self._queues[cls]) >= self.max_queue[cls]:
+            self._counts[cls]["rejected"] += 1
+            raise SchedulerRejected(f"{cls} LLM queue full ({self.max_queue[cls]})")
+
+        self._counts[cls]["admitted"] += 1
+        if self._in_flight < self.capacity and not self._has_eligible_waiter(overloaded) \
+                and self._eligible(cls, overloaded):
+            self._start(cls, 0.0)
+            return None
+        tag = max(self._virtual_time, self._last_tag[cls]) + 1.0 / self.weights[cls]
+        self._last_tag[cls] = tag
+        waiter = _Waiter(cls, tag, loop)
+        self._queues[cls].append(waiter)
+        return waiter
+
+    def _has_eligible_waiter(self, overloaded: bool) -> bool:
+        return any(queue and self._eligible(cls, overloaded) for cls, queue in self._queues.items())
+
+    def _start(self, cls: str, waited: float):
+        self._in_flight += 1
+        self._counts[cls]["in_flight"] += 1
+        self._waits[cls].append(waited)
+
+    def _dispatch(self):
+        """Hand free slots to the eligible waiters with the smallest finish tags."""
+        overloaded = self._overloaded()
+        while self._in_flight < self.capacity:
+            heads = [(queue[0].tag, cls) for cls, queue in self._queues.items()
+                     if queue and self._eligible(cls, overloaded)]
+            if not heads:
+                return
+            tag, cls = min(heads)
+            waiter = self._queues[cls].popleft()
+            self._virtual_time = max(self._virtual_time, tag)
+            self._start(cls, time.monotonic() - waiter.enqueued)
+            waiter.wake()
+
+    def _finish(self, cls: str, started: float):
+        with self._lock:
+            self._in_flight -= 1
+            self._counts[cls]["in_flight"] -= 1
+            self._counts[cls]["completed"] += 1
+            now = time.monotonic()
+            self._latencies[cls].append((now, now - started))
+            self._dispatch()
+
+    def _abandon(self, waiter: _Waiter):
+        """A waiter gave up (timeout/cancel); return its slot if it had just been granted one."""
+        with self._lock:
+            if waiter.granted:
+                self._in_flight -= 1
+                self._counts[waiter.cls]["in_flight"] -= 1
+                self._dispatch()
+            else:
+                self._queues[waiter.cls].remove(waiter)
+
+    def _recheck(self):
+        # Held-back background work must resume once stale interactive latencies age out,
+        # even if no call finishes to trigger a dispatch
+        with self._lock:
+            self._dispatch()
+
+    def _wait(self, waiter: _Waiter, timeout: float = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = POLL_SECONDS if deadline is None else min(POLL_SECONDS, deadline - time.monotonic())
+            if remaining <= 0:
+                return False
+            if waiter._event.wait(remaining):
+                return True
+            self._recheck()
+
+    # ---- public API ----
+
+    @contextmanager
+    def slot(self, cls: str = None, timeout: float = None):
+        """Hold one slot for the enclosed (blocking) call."""
+        cls = self._cls(cls or current_priority())
+        started = time.monotonic()
+        with self._lock:
+            waiter = self._admit(cls)
+        if waiter is not None and not self._wait(waiter, timeout):
+            self._abandon(waiter)
+            raise SchedulerRejected(f"{cls} LLM request waited longer than {timeout}s for a slot")
+        try:
+            yield
+        finally:
+            self._finish(cls, started)
+
+    @asynccontextmanager
+    async def aslot(self, cls: str = None):
+        """Async slot(); cancellation while queued gives up the place in line."""
+        cls = self._cls(cls or current_priority())
+        started = time.monotonic()
+        with self._lock:
+            waiter = self._admit(cls, asyncio.get_running_loop())
+        if waiter is not None:
+            try:
+                while True:
+                    try:
+                        await asyncio.wait_for(asyncio.shield(waiter._future), POLL_SECONDS)
+                        break
+                    except asyncio.TimeoutError:
+                        self._recheck()
+            except asyncio.CancelledError:
+                self._abandon(waiter)
+                raise
+        try:
+            yield
+        finally:
+            self._finish(cls, started)
+
+    def stats(self) -> dict:
+        """Per class: queue depth, in flight, counts, wait p50/p95 and latency p95 (seconds)."""
+        def percentile(values, q):
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None
+
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+                "overloaded": self._overloaded(),
+                "classes": {
+                    cls: dict(
+                        self._counts[cls],
+                        queued=len(self._queues[cls]),
+                        wait_p50=percentile(self._waits[cls], 0.5),
+                        wait_p95=percentile(self._waits[cls], 0.95),
+                        latency_p95=self._p95(cls),
+                    )
+                    for cls in self.weights
+                },
+            }
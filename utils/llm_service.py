@@ -1,107 +1,606 @@
-from langchain_huggingface import HuggingFaceEndpoint, ChatHuggingFace
 from langchain_core.prompts import PromptTemplate
+from src.fast_extract import FastExtractor
+from src.parsers import UserInfo, LearningResource
+from utils.llm_cache import ResponseCache, MISS
+from utils.semantic_cache import SemanticCache
+from utils.async_calls import call_with_retries
+from utils.single_flight import SingleFlight
+from utils.json_stream import IncrementalJSONParser, parse_json
+from utils.prompt_context import ContextBuilder
+from utils.handbook import HandbookRetriever
+from utils.llm_backends import load_backend, parse_method_backends, DEFAULT_BACKEND
+from utils.llm_scheduler import PriorityScheduler
+from utils.circuit_breaker import CircuitBreakers, CircuitOpenError
+from collections import deque
+import asyncio
+import threading
+import os
+import time
 import json
-import re
+
+# Seconds a cached response stays valid per method; 0 disables caching
+# (extract_user_info prompts carry passwords, so they are never stored)
+CACHE_TTLS = {
+    "extract_user_info": 0,
+    "generate_personalized_welcome": 7 * 24 * 3600,
+    "suggest_learning_path": 24 * 3600,
+    "answer_onboarding_question": 3600,
+}
+
+# Per-call deadlines (seconds) for the async API, covering retries and backoff
+ASYNC_TIMEOUTS = {
+    "extract_user_info": 15,
+    "generate_personalized_welcome": 45,
+    "suggest_learning_path": 45,
+    "answer_onboarding_question": 30,
+}
+
+# Cap on in-flight model requests (sync, streaming and async), shared by every LLMService.
+# Interactive calls are served ahead of background jobs (see utils/llm_scheduler.py); when
+# LLM_INTERACTIVE_P95 (seconds) is set, background calls are held back - or rejected, with
+# LLM_SHED_BACKGROUND=1 - while the interactive p95 latency is above it.
+MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+_p95_threshold = os.getenv("LLM_INTERACTIVE_P95")
+SCHEDULER = PriorityScheduler(
+    capacity=MAX_IN_FLIGHT,
+    interactive_p95_threshold=float(_p95_threshold) if _p95_threshold else None,
+    shed_background=os.getenv("LLM_SHED_BACKGROUND", "0") == "1",
+)
+
+# Calls slower than this (seconds) count against their method's circuit breaker. A circuit
+# per method and backend opens on a high error or slow-call rate; while open, calls return
+# a cached (possibly expired) response or their fallback immediately.
+SLOW_CALL_SECONDS = {
+    "extract_user_info": 8,
+    "generate_personalized_welcome": 20,
+    "suggest_learning_path": 20,
+    "answer_onboarding_question": 15,
+}
+BREAKERS = CircuitBreakers(slow_call_seconds=SLOW_CALL_SECONDS)
+
+# Methods whose output is a single JSON value: (kind, object schema, array item schema).
+# Their completions are streamed and cut off as soon as that value closes.
+STRUCTURED_OUTPUTS = {
+    "extract_user_info": ("object", UserInfo, None),
+    "suggest_learning_path": ("array", None, LearningResource),
+}
+
+ANSWER_FALLBACK = "I'm having trouble answering that right now. Please contact your HR representative."
+
+# Prompts are built once at import and shared by the blocking and streaming methods
+EXTRACT_PROMPT = PromptTemplate(
+    template=(
+        "You are an AI assistant for onboarding. Extract name, email, password from natural language.\n"
+        "Return JSON only, no extra text. Example:\n"
+        '{{"name": "John Doe", "email": "john@example.com", "password": "secure123"}}\n\n'
+        "User Input: {user_input}"
+    ),
+    input_variables=["user_input"],
+)
+
+WELCOME_PROMPT = PromptTemplate(
+    template=(
+        "Generate a warm, professional welcome message for a new employee.\n"
+        "Name: {name}\n"
+        "Role: {role}\n"
+        "Department: {department}\n\n"
+        "Make it friendly, encouraging, and mention 2-3 specific things they should focus on in their first week."
+    ),
+    input_variables=["name", "role", "department"],
+)
+
+LEARNING_PATH_PROMPT = PromptTemplate(
+    template=(
+        "Suggest 5 learning resources or training modules for:\n"
+        "Role: {role}\n"
+        "Plan: {plan}\n\n"
+        "Return as JSON array: [{{\"title\": \"...\", \"description\": \"...\", \"duration\": \"...\"}}]"
+    ),
+    input_variables=["role", "plan"],
+)
+
+ANSWER_PROMPT = PromptTemplate(
+    template=(
+        "You are an onboarding assistant. Answer the following question helpfully and concisely.\n"
+        "User context: {context}\n\n"
+        "Company handbook excerpts (prefer these over general knowledge):\n{handbook}\n\n"
+        "Question: {question}\n\n"
+        "Provide a clear, actionable answer."
+    ),
+    input_variables=["question", "context", "handbook"],
+)
+
 
 class LLMService:
-    def __init__(self):
+    def __init__(self, cache_path: str = None, semantic_cache: bool = True, max_retries: int = 3,
+                 hedge_after: float = None, context_token_budget: int = 128, handbook: bool = True,
+                 backend: str = None, method_backends: dict = None, scheduler: PriorityScheduler = None,
+                 breakers: CircuitBreakers = None):
+        self.model_params = {
+            "repo_id": "mistralai/Mistral-7B-Instruct-v0.3",
+            "task": "text-generation",
+            "max_new_tokens": 512,
+            "temperature": 0.3,
+        }
+        # "huggingface", "http" or "local" (see utils/llm_backends.py); defaults to LLM_BACKEND
+        self.backend = (backend or DEFAULT_BACKEND).lower()
+        # Per-method overrides, e.g. {"extract_user_info": "local"}; defaults to LLM_METHOD_BACKENDS
+        self.method_backends = method_backends if method_backends is not None else parse_method_backends(
+            os.getenv("LLM_METHOD_BACKENDS", "")
+        )
         self.llm = self._load_model()
+        self._backends = {self.backend: self.llm}
+        self._backends_lock = threading.Lock()
+        # Rule-based extraction tried before the LLM; fast_extractor.stats() reports its hit rate
+        self.fast_extractor = FastExtractor()
+        # In-memory LRU, backed by SQLite when LLM_CACHE_PATH (or cache_path) is set
+        self.cache = ResponseCache(db_path=cache_path or os.getenv("LLM_CACHE_PATH"), ttls=CACHE_TTLS)
+        # Recent time-to-first-token and total generation time per streaming method (seconds)
+        self._stream_timings = {}
+        # Async API: transient-error retries, and an optional duplicate request after
+        # `hedge_after` seconds to cut tail latency
+        self.max_retries = max_retries
+        self.hedge_after = hedge_after
+        # Identical concurrent prompts share one request; single_flight.stats() counts the savings
+        self.single_flight = SingleFlight()
+        # Per structured method: calls, early stops and chunks read
+        self._structured_stats = {}
+        # Admission to the model endpoint by priority class; scheduler.stats() shows queues and waits
+        self.scheduler = scheduler or SCHEDULER
+        # Fail fast while an endpoint is degraded; circuit_stats() shows which circuits are open
+        self.breakers = breakers or BREAKERS
+        # Only relevant, summarized user fields reach the answer prompt, within a token budget
+        self.context_builder = ContextBuilder(token_budget=context_token_budget)
+        self._prompt_tokens = deque(maxlen=1000)   # (before, after) pruning, per answer prompt
+        # Reuses answers to differently-worded questions across everyone with the same plan/department/role.
+        # While it is on, answer prompts carry only those fields (no name or progress), so a shared answer
+        # is never addressed to one user. Expires with the response cache's answer TTL and is cleared by
+        # invalidate_cache()
+        answer_ttl = self.cache.ttl("answer_onboarding_question")
+        self.semantic_cache = SemanticCache(ttl=answer_ttl) if semantic_cache and answer_ttl else None
+        # Grounds answers in the top handbook chunks that fit a fixed token budget
+        self.handbook = HandbookRetriever(counter=self.context_builder.count_tokens) if handbook else None
     
-    def _load_model(self):
-        """Load the HuggingFace model"""
-        llm = HuggingFaceEndpoint(
-            repo_id="mistralai/Mistral-7B-Instruct-v0.3",
-            task="text-generation",
-            max_new_tokens=512,
-            temperature=0.3,
-        )
-        return ChatHuggingFace(llm=llm)
+    def _load_model(self, backend: str = None):
+        """Load a chat backend (the default one unless `backend` is given)"""
+        return load_backend(backend or self.backend, self.model_params)
+    
+    def _llm_for(self, method: str):
+        """Backend serving `method`, loaded on first use and shared between methods"""
+        name = self.method_backends.get(method, self.backend)
+        llm = self._backends.get(name)
+        if llm is None:
+            with self._backends_lock:
+                llm = self._backends.get(name)
+                if llm is None:
+                    llm = self._backends[name] = self._load_model(name)
+        return llm
+    
+    def _cache_key(self, method: str, prompt: str) -> str:
+        # Includes the serving backend so stand-in or local output never answers for the remote model
+        params = dict(self.model_params, backend=self.method_backends.get(method, self.backend))
+        return self.cache.make_key(method, prompt, params)
+    
+    def _breaker(self, method: str):
+        return self.breakers.get(method, self.method_backends.get(method, self.backend))
+    
+    def _while_open(self, method: str, key: str):
+        """Expired cached response for a method whose circuit is open, else CircuitOpenError"""
+        stale = self.cache.get(method, key, stale=True)
+        if stale is not MISS:
+            return stale
+        raise CircuitOpenError(f"LLM circuit {self._breaker(method).name} is open")
+    
+    def circuit_stats(self) -> dict:
+        """State, recent error and slow-call rates and trip count per method/backend circuit"""
+        return self.breakers.stats()
+    
+    def _invoke(self, method: str, prompt: str) -> str:
+        """Run a prompt through the model and return the text, serving repeats from the cache"""
+        key = self._cache_key(method, prompt)
+        cached = self.cache.get(method, key)
+        if cached is not MISS:
+            return cached
+        breaker = self._breaker(method)
+        if breaker.is_open():
+            return self._while_open(method, key)
+        
+        def call():
+            with self.scheduler.slot(), breaker.guard():
+                if method in STRUCTURED_OUTPUTS:
+                    parser = self._json_parser(method)
+                    stream = self._llm_for(method).stream(prompt)
+                    try:
+                        for chunk in stream:
+                            if parser.feed(chunk.content if hasattr(chunk, 'content') else str(chunk)):
+                                break
+                    finally:
+                        stream.close()  # closing the stream stops generation
+                    content = self._finish_structured(method, parser)
+                else:
+                    response = self._llm_for(method).invoke(prompt)
+                    content = response.content if hasattr(response, 'content') else str(response)
+            if self._cacheable(method, content):
+                self.cache.set(method, key, content)
+            return content
+        
+        try:
+            return self.single_flight.do(key, call)
+        except CircuitOpenError:
+            return self._while_open(method, key)
+    
+    @staticmethod
+    def _json_parser(method: str) -> IncrementalJSONParser:
+        kind, model, item_model = STRUCTURED_OUTPUTS[method]
+        return IncrementalJSONParser(kind, model=model, item_model=item_model)
+    
+    def _finish_structured(self, method: str, parser: IncrementalJSONParser) -> str:
+        """Record early-stop stats and return the JSON text (or everything read, if it never closed)"""
+        stats = self._structured_stats.setdefault(method, {"calls": 0, "early_stops": 0, "chunks": 0})
+        stats["calls"] += 1
+        stats["chunks"] += parser.chunks
+        if parser.done:
+            stats["early_stops"] += 1
+            return parser.text
+        return "".join(parser.received)
+    
+    @staticmethod
+    def _cacheable(method: str, content: str) -> bool:
+        """False for structured completions whose JSON never closed (truncated, prose) or holds nothing"""
+        if method not in STRUCTURED_OUTPUTS:
+            return True
+        kind, model, item_model = STRUCTURED_OUTPUTS[method]
+        value = parse_json(content, kind, model=model, item_model=item_model)
+        if isinstance(value, dict):
+            return any(value.values())
+        return bool(value)
+    
+    def structured_stats(self) -> dict:
+        """Calls, completed-early count and mean chunks read per structured method"""
+        return {
+            method: dict(stats, mean_chunks=stats["chunks"] / stats["calls"] if stats["calls"] else 0.0)
+            for method, stats in self._structured_stats.items()
+        }
+    
+    def _stream(self, method: str, prompt: str):
+        """Yield the model's text chunks as they arrive; cached responses come back as one chunk"""
+        key = self._cache_key(method, prompt)
+        cached = self.cache.get(method, key)
+        if cached is not MISS:
+            yield cached
+            return
+        breaker = self._breaker(method)
+        if breaker.is_open():
+            yield self._while_open(method, key)
+            return
+        
+        start = time.perf_counter()
+        first_token = None
+        parts = []
+        # The slot is held until the stream ends or the consumer closes it
+        with self.scheduler.slot(), breaker.guard():
+            for chunk in self._llm_for(method).stream(prompt):
+                text = chunk.content if hasattr(chunk, 'content') else str(chunk)
+                if not text:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                parts.append(text)
+                yield text
+        
+        timings = self._stream_timings.setdefault(method, {"ttft": deque(maxlen=500), "total": deque(maxlen=500)})
+        timings["ttft"].append(first_token if first_token is not None else time.perf_counter() - start)
+        timings["total"].append(time.perf_counter() - start)
+        self.cache.set(method, key, "".join(parts))
+    
+    def streaming_stats(self) -> dict:
+        """p50/p95 time-to-first-token and total time (seconds) per streaming method"""
+        def percentile(values, q):
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None
+        
+        return {
+            method: {
+                "calls": len(timings["ttft"]),
+                "ttft_p50": percentile(timings["ttft"], 0.5),
+                "ttft_p95": percentile(timings["ttft"], 0.95),
+                "total_p50": percentile(timings["total"], 0.5),
+            }
+            for method, timings in self._stream_timings.items()
+        }
+    
+    def _answer_prompt(self, question: str, context: dict) -> str:
+        """ANSWER_PROMPT with the pruned context and handbook excerpts; records prompt tokens with and without pruning"""
+        pruned, _ = self.context_builder.build(self._shared_context(context))
+        handbook = self._handbook_context(question)
+        prompt = ANSWER_PROMPT.format(question=question, context=pruned, handbook=handbook)
+        count = self.context_builder.count_tokens
+        full = ANSWER_PROMPT.format(question=question, context=json.dumps(context, default=str), handbook=handbook)
+        self._prompt_tokens.append((count(full), count(prompt)))
+        return prompt
+    
+    def _shared_context(self, context: dict) -> dict:
+        """The context fields a semantically cached answer may depend on (all of them when it is off)"""
+        if self.semantic_cache is None:
+            return context
+        return {field: context[field] for field in self.semantic_cache.scope_fields if field in context}
+    
+    def _handbook_context(self, question: str) -> str:
+        """Relevant handbook chunks for the question, or "(none)" """
+        if self.handbook is None:
+            return "(none)"
+        try:
+            return self.handbook.context_for(question) or "(none)"
+        except Exception as e:
+            print(f"Handbook retrieval error: {e}")
+            return "(none)"
+    
+    def context_stats(self) -> dict:
+        """Mean answer-prompt tokens before and after context pruning"""
+        samples = list(self._prompt_tokens)
+        if not samples:
+            return {"prompts": 0, "tokens_before": 0.0, "tokens_after": 0.0, "reduction": 0.0}
+        before = sum(b for b, _ in samples) / len(samples)
+        after = sum(a for _, a in samples) / len(samples)
+        return {
+            "prompts": len(samples),
+            "tokens_before": before,
+            "tokens_after": after,
+            "reduction": 1 - after / before if before else 0.0,
+        }
+    
+    def _semantic_lookup(self, question: str, context: dict):
+        """Cached answer to a similar question in the same scope, or None"""
+        if self.semantic_cache is None:
+            return None
+        try:
+            hit = self.semantic_cache.lookup(question, context)
+            return hit[0] if hit is not None else None
+        except Exception as e:
+            print(f"Semantic cache error: {e}")
+            return None
+    
+    def _semantic_store(self, question: str, answer: str, context: dict):
+        if self.semantic_cache is None:
+            return
+        try:
+            self.semantic_cache.store(question, answer, context)
+        except Exception as e:
+            print(f"Semantic cache error: {e}")
+    
+    @staticmethod
+    def _parse_user_info(content: str, fast: dict) -> dict:
+        """First JSON object in the completion, validated against UserInfo; fast-path values fill its gaps"""
+        parsed = parse_json(content, "object", model=UserInfo) or {}
+        return {**fast, **{field: value for field, value in parsed.items() if value}}
+    
+    @staticmethod
+    def _parse_learning_path(content: str) -> list:
+        """First JSON array in the completion, keeping items that validate as LearningResource"""
+        return parse_json(content, "array", item_model=LearningResource) or []
+    
+    def invalidate_cache(self, method: str = None):
+        """Forget cached responses for one method, or all of them (semantic answers included)"""
+        self.cache.invalidate(method=method)
+        if self.semantic_cache is not None and method in (None, "answer_onboarding_question"):
+            self.semantic_cache.invalidate()
     
     def extract_user_info(self, user_input: str) -> dict:
         """Extract name, email, password from natural language"""
-        prompt = PromptTemplate(
-            template=(
-                "You are an AI assistant for onboarding. Extract name, email, password from natural language.\n"
-                "Return JSON only, no extra text. Example:\n"
-                '{"name": "John Doe", "email": "john@example.com", "password": "secure123"}\n\n'
-                "User Input: {user_input}"
-            ),
-            input_variables=["user_input"],
-        )
+        fields = ("name", "email", "password")
+        fast = self.fast_extractor.extract(user_input, fields)
+        if len(fast) == len(fields):
+            self.fast_extractor.record(hit=True)
+            return fast
+        self.fast_extractor.record(hit=False)
         
         try:
-            response = self.llm.invoke(prompt.format(user_input=user_input))
-            content = response.content if hasattr(response, 'content') else str(response)
-            
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            return {}
+            content = self._invoke("extract_user_info", EXTRACT_PROMPT.format(user_input=user_input))
+            return self._parse_user_info(content, fast)
         except Exception as e:
             print(f"LLM error: {e}")
-            return {}
+            return fast
     
     def generate_personalized_welcome(self, name: str, role: str, department: str) -> str:
         """Generate personalized welcome message"""
-        prompt = PromptTemplate(
-            template=(
-                "Generate a warm, professional welcome message for a new employee.\n"
-                "Name: {name}\n"
-                "Role: {role}\n"
-                "Department: {department}\n\n"
-                "Make it friendly, encouraging, and mention 2-3 specific things they should focus on in their first week."
-            ),
-            input_variables=["name", "role", "department"],
-        )
-        
         try:
-            response = self.llm.invoke(prompt.format(name=name, role=role, department=department))
-            return response.content if hasattr(response, 'content') else str(response)
+            return self._invoke(
+                "generate_personalized_welcome", WELCOME_PROMPT.format(name=name, role=role, department=department)
+            )
         except Exception as e:
             print(f"LLM error: {e}")
             return f"Welcome to the team, {name}! We're excited to have you join {department}."
     
+    def stream_personalized_welcome(self, name: str, role: str, department: str):
+        """Streaming variant of generate_personalized_welcome; yields text chunks"""
+        prompt = WELCOME_PROMPT.format(name=name, role=role, department=department)
+        produced = False
+        try:
+            for text in self._stream("generate_personalized_welcome", prompt):
+                produced = True
+                yield text
+        except Exception as e:
+            print(f"LLM error: {e}")
+            if not produced:
+                yield f"Welcome to the team, {name}! We're excited to have you join {department}."
+    
     def suggest_learning_path(self, role: str, plan: str) -> list:
         """Suggest personalized learning resources"""
-        prompt = PromptTemplate(
-            template=(
-                "Suggest 5 learning resources or training modules for:\n"
-                "Role: {role}\n"
-                "Plan: {plan}\n\n"
-                "Return as JSON array: [{\"title\": \"...\", \"description\": \"...\", \"duration\": \"...\"}]"
-            ),
-            input_variables=["role", "plan"],
-        )
-        
         try:
-            response = self.llm.invoke(prompt.format(role=role, plan=plan))
-            content = response.content if hasattr(response, 'content') else str(response)
-            
-            # Extract JSON array
-            json_match = re.search(r'\[.*\]', content, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            return []
+            content = self._invoke("suggest_learning_path", LEARNING_PATH_PROMPT.format(role=role, plan=plan))
+            return self._parse_learning_path(content)
         except Exception as e:
             print(f"LLM error: {e}")
             return []
     
     def answer_onboarding_question(self, question: str, context: dict) -> str:
         """Answer user questions about onboarding"""
-        prompt = PromptTemplate(
-            template=(
-                "You are an onboarding assistant. Answer the following question helpfully and concisely.\n"
-                "User context: {context}\n\n"
-                "Question: {question}\n\n"
-                "Provide a clear, actionable answer."
-            ),
-            input_variables=["question", "context"],
-        )
+        cached = self._semantic_lookup(question, context)
+        if cached is not None:
+            return cached
         
         try:
-            response = self.llm.invoke(prompt.format(question=question, context=json.dumps(context)))
-            return response.content if hasattr(response, 'content') else str(response)
+            answer = self._invoke(
+                "answer_onboarding_question", self._answer_prompt(question, context)
+            )
         except Exception as e:
             print(f"LLM error: {e}")
-            return "I'm having trouble answering that right now. Please contact your HR representative."
\ No newline at end of file
+            return ANSWER_FALLBACK
+        
+        self._semantic_store(question, answer, context)
+        return answer
+    
+    def stream_onboarding_answer(self, question: str, context: dict):
+        """Streaming variant of answer_onboarding_question; yields text chunks"""
+        cached = self._semantic_lookup(question, context)
+        if cached is not None:
+            yield cached
+            return
+        
+        prompt = self._answer_prompt(question, context)
+        parts = []
+        try:
+            for text in self._stream("answer_onboarding_question", prompt):
+                parts.append(text)
+                yield text
+        except Exception as e:
+            print(f"LLM error: {e}")
+            if not parts:
+                yield ANSWER_FALLBACK
+            return
+        
+        self._semantic_store(question, "".join(parts), context)
+    
+    # ===========================
+    # Async API
+    # ===========================
+    async def _ainvoke(self, method: str, prompt: str, timeout: float = None) -> str:
+        """Async _invoke: scheduled concurrency, overall deadline, retries with jittered backoff, optional hedging"""
+        key = self._cache_key(method, prompt)
+        cached = self.cache.get(method, key)
+        if cached is not MISS:
+            return cached
+        breaker = self._breaker(method)
+        if breaker.is_open():
+            return self._while_open(method, key)
+        
+        async def attempt():
+            async with self.scheduler.aslot():
+                with breaker.guard():
+                    if method in STRUCTURED_OUTPUTS:
+                        parser = self._json_parser(method)
+                        stream = self._llm_for(method).astream(prompt)
+                        try:
+                            async for chunk in stream:
+                                if parser.feed(chunk.content if hasattr(chunk, 'content') else str(chunk)):
+                                    break
+                        finally:
+                            await stream.aclose()
+                        return self._finish_structured(method, parser)
+                    response = await self._llm_for(method).ainvoke(prompt)
+            return response.content if hasattr(response, 'content') else str(response)
+        
+        async def call():
+            deadline = asyncio.get_running_loop().time() + (timeout or ASYNC_TIMEOUTS[method])
+            content = await call_with_retries(attempt, deadline, retries=self.max_retries,
+                                              hedge_after=self.hedge_after)
+            if self._cacheable(method, content):
+                self.cache.set(method, key, content)
+            return content
+        
+        try:
+            return await self.single_flight.ado(key, call)
+        except CircuitOpenError:
+            return self._while_open(method, key)
+    
+    async def aextract_user_info(self, user_input: str, timeout: float = None) -> dict:
+        """Async extract_user_info"""
+        fields = ("name", "email", "password")
+        fast = self.fast_extractor.extract(user_input, fields)
+        if len(fast) == len(fields):
+            self.fast_extractor.record(hit=True)
+            return fast
+        self.fast_extractor.record(hit=False)
+        
+        try:
+            content = await self._ainvoke("extract_user_info", EXTRACT_PROMPT.format(user_input=user_input), timeout)
+            return self._parse_user_info(content, fast)
+        except Exception as e:
+            print(f"LLM error: {e!r}")
+            return fast
+    
+    async def agenerate_personalized_welcome(self, name: str, role: str, department: str,
+                                             timeout: float = None) -> str:
+        """Async generate_personalized_welcome"""
+        try:
+            return await self._ainvoke(
+                "generate_personalized_welcome", WELCOME_PROMPT.format(name=name, role=role, department=department),
+                timeout,
+            )
+        except Exception as e:
+            print(f"LLM error: {e!r}")
+            return f"Welcome to the team, {name}! We're excited to have you join {department}."
+    
+    async def agenerate_welcome_batch(self, people, concurrency: int = None, timeout: float = None):
+        """
+        Yield (person, welcome, error) for each {"name", "role", "department"} dict as
+        generations finish, pulling from `people` lazily with at most `concurrency` in flight
+        """
+        concurrency = concurrency or MAX_IN_FLIGHT
+        
+        async def generate(person):
+            prompt = WELCOME_PROMPT.format(
+                name=person["name"], role=person.get("role") or "Employee",
+                department=person.get("department") or "the team",
+            )
+            try:
+                return person, await self._ainvoke("generate_personalized_welcome", prompt, timeout), None
+            except Exception as e:
+                return person, None, repr(e)
+        
+        pending = set()
+        try:
+            for person in people:
+                pending.add(asyncio.ensure_future(generate(person)))
+                if len(pending) < concurrency:
+                    continue
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:  # consumer stopped early
+                task.cancel()
+    
+    async def asuggest_learning_path(self, role: str, plan: str, timeout: float = None) -> list:
+        """Async suggest_learning_path"""
+        try:
+            content = await self._ainvoke(
+                "suggest_learning_path", LEARNING_PATH_PROMPT.format(role=role, plan=plan), timeout
+            )
+            return self._parse_learning_path(content)
+        except Exception as e:
+            print(f"LLM error: {e!r}")
+            return []
+    
+    async def aanswer_onboarding_question(self, question: str, context: dict, timeout: float = None) -> str:
+        """Async answer_onboarding_question"""
+        # Embedding the question is CPU work; keep it off the event loop
+        cached = await asyncio.to_thread(self._semantic_lookup, question, context)
+        if cached is not None:
+            return cached
+        
+        try:
+            answer = await self._ainvoke(
+                "answer_onboarding_question", self._answer_prompt(question, context),
+                timeout,
+            )
+        except Exception as e:
+            print(f"LLM error: {e!r}")
+            return ANSWER_FALLBACK
+        
+        await asyncio.to_thread(self._semantic_store, question, answer, context)
+        return answer
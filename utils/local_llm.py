@@ -0,0 +1,148 @@
+import os
+import queue
+import asyncio
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import List
+from utils.llm_backends import LLMBackend
+
+LOCAL_MODEL_NAME = os.getenv("LOCAL_LLM_MODEL", "Qwen/Qwen2.5-0.5B-Instruct")
+LOCAL_MODEL_DIR = os.getenv("LOCAL_LLM_DIR", os.path.join("models", "qwen2.5-0.5b-instruct-onnx"))
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+
+
+class LocalBackend(LLMBackend):
+    """
+    Small instruction model run on CPU through onnxruntime (int8 ONNX
+    export, see export_local_model). Concurrent requests are queued and
+    generated together: the batcher thread waits up to `max_wait_ms` for
+    up to `max_batch_size` prompts, left-pads them into one batch and
+    decodes them in a single generate() call. Decoding is greedy, so
+    repeated prompts give repeatable answers.
+    """
+
+    def __init__(self, model_dir: str = LOCAL_MODEL_DIR, model_file: str = QUANTIZED_MODEL_FILE,
+                 max_new_tokens: int = 256, max_batch_size: int = 8, max_wait_ms: float = 10.0,
+                 num_threads: int = 0, timeout: float = 120.0):
+        import onnxruntime as ort
+        from optimum.onnxruntime import ORTModelForCausalLM
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        self.model = ORTModelForCausalLM.from_pretrained(
+            model_dir, file_name=model_file, session_options=options, provider="CPUExecutionProvider",
+        )
+        self.max_new_tokens = max_new_tokens
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.timeout = timeout   # blocking invoke() gives up after this many seconds
+        self._requests = queue.Queue()
+        self.batches = 0
+        self.batched_requests = 0
+        threading.Thread(target=self._batch_loop, name="local-llm-batcher", daemon=True).start()
+
+    def _prompt(self, prompt: str) -> str:
+        return self.tokenizer.apply_chat_template(
+            [{"role": "user", "content": prompt}], tokenize=False, add_generation_prompt=True,
+        )
+
+    def _generate(self, prompts: List[str]) -> List[str]:
+        inputs = self.tokenizer([self._prompt(p) for p in prompts], return_tensors="pt", padding=True)
+        output = self.model.generate(
+            **inputs, max_new_tokens=self.max_new_tokens, do_sample=False,
+            pad_token_id=self.tokenizer.pad_token_id,
+        )
+        new_tokens = output[:, inputs["input_ids"].shape[1]:]
+        return self.tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
+
+    def _next_batch(self) -> list:
+        """Block for the first request, then gather more for up to max_wait; drops cancelled ones."""
+        batch = []
+        timeout = None
+        while len(batch) < self.max_batch_size:
+            try:
+                prompt, future = self._requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            # Callers that timed out or were cancelled (deadlines, hedging) no longer need a result
+            if future.set_running_or_notify_cancel():
+                batch.append((prompt, future))
+            if batch:
+                timeout = self.max_wait
+        return batch
+
+    @staticmethod
+    def _settle(future: Future, text: str = None, error: Exception = None):
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(text)
+        except Exception as e:
+            print(f"Local LLM: could not deliver a result ({e!r})")
+
+    def _batch_loop(self):
+        # Must never exit: every later request would wait on a dead batcher
+        while True:
+            batch = self._next_batch()
+            try:
+                texts = self._generate([prompt for prompt, _ in batch])
+                for (_, future), text in zip(batch, texts):
+                    self._settle(future, text)
+            except Exception as e:
+                for _, future in batch:
+                    self._settle(future, error=e)
+            self.batches += 1
+            self.batched_requests += len(batch)
+
+    def _submit(self, prompt: str) -> Future:
+        future = Future()
+        self._requests.put((prompt, future))
+        return future
+
+    def invoke(self, prompt: str) -> str:
+        future = self._submit(prompt)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()  # dropped by the batcher if it hasn't started yet
+            raise
+
+    async def ainvoke(self, prompt: str) -> str:
+        return await asyncio.wrap_future(self._submit(prompt))
+
+    def stats(self) -> dict:
+        """Batches run and mean requests per batch."""
+        return {
+            "batches": self.batches,
+            "requests": self.batched_requests,
+            "mean_batch_size": self.batched_requests / self.batches if self.batches else 0.0,
+            "queued": self._requests.qsize(),
+        }
+
+
+def export_local_model(output_dir: str = LOCAL_MODEL_DIR, model_name: str = LOCAL_MODEL_NAME) -> str:
+    """Export the model to ONNX and write a dynamically int8-quantized copy next to it."""
+    from optimum.onnxruntime import ORTModelForCausalLM, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    model = ORTModelForCausalLM.from_pretrained(model_name, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+
+    quantizer = ORTQuantizer.from_pretrained(output_dir, file_name="model.onnx")
+    config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=output_dir, quantization_config=config)
+    return os.path.join(output_dir, QUANTIZED_MODEL_FILE)
+
+
+if __name__ == "__main__":
+    import sys
+    output = sys.argv[1] if len(sys.argv) > 1 else LOCAL_MODEL_DIR
+    print(f"✅ Quantized model written to {export_local_model(output)}")
@@ -0,0 +1,91 @@
+import os
+import re
+import json
+from typing import Iterable, Optional
+
+# Fields worth showing the model, most important first. When the budget is
+# tight, fields are dropped from the end of this list. Anything not listed
+# (password, email, raw timestamps, ...) never reaches the prompt.
+CONTEXT_FIELDS = (
+    "name", "role", "department", "plan", "days_active",
+    "onboarding_progress", "mentor_assigned", "buddy_assigned", "checklist_completed",
+)
+
+# tokenizer.json of the chat model (or a close relative); without it a
+# word/punctuation regex approximates the count
+TOKENIZER_FILE = os.getenv("PROMPT_TOKENIZER_FILE")
+
+_WORD_PIECES = re.compile(r"\w+|[^\w\s]")
+
+
+class TokenCounter:
+    """Counts prompt tokens locally, with the model's tokenizer.json when available."""
+
+    def __init__(self, tokenizer_file: Optional[str] = TOKENIZER_FILE):
+        self.tokenizer = None
+        if tokenizer_file and os.path.exists(tokenizer_file):
+            try:
+                from tokenizers import Tokenizer
+                self.tokenizer = Tokenizer.from_file(tokenizer_file)
+            except ImportError:
+                print("⚠️ tokenizers not installed; approximating prompt token counts")
+
+    def __call__(self, text: str) -> int:
+        if self.tokenizer is not None:
+            return len(self.tokenizer.encode(text, add_special_tokens=False).ids)
+        # Subword tokenizers split long words; roughly one extra token per 4 characters beyond the first 4
+        return sum(1 + max(0, len(piece) - 4) // 4 for piece in _WORD_PIECES.findall(text))
+
+
+class ContextBuilder:
+    """
+    Turns a user record into the compact JSON context for a prompt: keeps
+    only CONTEXT_FIELDS, summarizes long lists, truncates long strings and
+    drops the least important fields until the context fits `token_budget`.
+    """
+
+    def __init__(self, fields: Iterable[str] = CONTEXT_FIELDS, token_budget: int = 128,
+                 max_list_items: int = 3, max_chars: int = 120, counter: TokenCounter = None):
+        self.fields = tuple(fields)
+        self.token_budget = token_budget
+        self.max_list_items = max_list_items
+        self.max_chars = max_chars
+        self.count_tokens = counter or TokenCounter()
+
+    def _compact(self, value):
+        if isinstance(value, (list, tuple, set)):
+            items = [str(item) for item in value]
+            if len(items) <= self.max_list_items:
+                return items
+            # Most recent entries say the most about where the user is now
+            return f"{len(items)} items, latest: {', '.join(items[-self.max_list_items:])}"
+        if isinstance(value, dict):
+            return f"{len(value)} entries"
+        if isinstance(value, str) and len(value) > self.max_chars:
+            return value[:self.max_chars - 1] + "…"
+        return value
+
+    def build(self, context: dict) -> tuple:
+        """(context JSON, report) where report has tokens before/after and the fields dropped."""
+        context = context or {}
+        before = self.count_tokens(json.dumps(context, default=str))
+
+        selected = {
+            field: self._compact(context[field])
+            for field in self.fields
+            if field in context and context[field] not in (None, "", [], {})
+        }
+        text = json.dumps(selected, ensure_ascii=False, default=str)
+        over_budget = []
+        while len(selected) > 1 and self.count_tokens(text) > self.token_budget:
+            field = next(reversed(selected))
+            over_budget.append(field)
+            del selected[field]
+            text = json.dumps(selected, ensure_ascii=False, default=str)
+
+        return text, {
+            "tokens_before": before,
+            "tokens_after": self.count_tokens(text),
+            "omitted": sorted(set(context) - set(selected) - set(over_budget)),
+            "over_budget": over_budget,
+        }
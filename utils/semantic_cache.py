@@ -0,0 +1,117 @@
+import time
+import threading
+import numpy as np
+from typing import Iterable, Optional, Tuple
+
+# Context fields that change what the right answer is. Only enough when the
+# prompt uses nothing else: a prompt that also includes the user's name or
+# progress must add those fields to the scope, or answers leak across users.
+DEFAULT_SCOPE_FIELDS = ("plan", "department", "role")
+
+
+class SemanticCache:
+    """
+    Answer cache matched on meaning rather than exact text: questions are
+    embedded and looked up in a FAISS inner-product index per scope, and a
+    stored answer is returned when the closest previous question is at
+    least `threshold` cosine-similar. Scopes keep answers for different
+    plans/departments apart.
+    """
+
+    def __init__(self, threshold: float = 0.92, scope_fields: Iterable[str] = DEFAULT_SCOPE_FIELDS,
+                 max_entries_per_scope: int = 2000, ttl: Optional[float] = 24 * 3600,
+                 embedding_model=None, embedding_backend: str = None):
+        self.threshold = threshold
+        self.scope_fields = tuple(scope_fields)
+        self.max_entries_per_scope = max_entries_per_scope
+        self.ttl = ttl
+        self.embedding_backend = embedding_backend
+        self._embedding_model = embedding_model
+        self._model_lock = threading.Lock()
+        self._scopes = {}   # scope -> {"index", "vectors", "answers", "created"}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def embedding_model(self):
+        """Load the embedding model on first use."""
+        if self._embedding_model is None:
+            with self._model_lock:
+                if self._embedding_model is None:
+                    from src.embeddings import load_embedding_model
+                    self._embedding_model = load_embedding_model(self.embedding_backend)
+        return self._embedding_model
+
+    def scope_of(self, context: dict) -> tuple:
+        """Normalized values of the fields that change the answer."""
+        return tuple(str(context.get(field, "")).strip().lower() for field in self.scope_fields)
+
+    def _embed(self, question: str) -> np.ndarray:
+        vector = np.array([self.embedding_model.embed_query(" ".join(question.split()))], dtype="float32")
+        return vector / np.clip(np.linalg.norm(vector, axis=1, keepdims=True), 1e-12, None)
+
+    def lookup(self, question: str, context: dict) -> Optional[Tuple[str, float]]:
+        """(answer, similarity) of the closest cached question in scope, or None below the threshold."""
+        scope = self.scope_of(context)
+        with self._lock:
+            empty = scope not in self._scopes or not self._scopes[scope]["index"].ntotal
+        if empty:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        vector = self._embed(question)
+        with self._lock:
+            entry = self._scopes.get(scope)
+            D, I = entry["index"].search(vector, 1)
+            similarity, position = float(D[0][0]), int(I[0][0])
+            fresh = self.ttl is None or time.time() - entry["created"][position] < self.ttl
+            if position >= 0 and similarity >= self.threshold and fresh:
+                self.hits += 1
+                return entry["answers"][position], similarity
+            self.misses += 1
+            return None
+
+    def store(self, question: str, answer: str, context: dict):
+        """Remember the answer for this question within its scope."""
+        import faiss
+
+        vector = self._embed(question)
+        scope = self.scope_of(context)
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None:
+                entry = self._scopes[scope] = {
+                    "index": faiss.IndexFlatIP(vector.shape[1]), "vectors": [], "answers": [], "created": [],
+                }
+            if len(entry["answers"]) >= self.max_entries_per_scope:
+                # Drop the oldest half and rebuild; flat indexes rebuild in milliseconds
+                keep = len(entry["answers"]) // 2
+                for key in ("vectors", "answers", "created"):
+                    entry[key] = entry[key][-keep:]
+                entry["index"] = faiss.IndexFlatIP(vector.shape[1])
+                entry["index"].add(np.vstack(entry["vectors"]))
+            entry["index"].add(vector)
+            entry["vectors"].append(vector)
+            entry["answers"].append(answer)
+            entry["created"].append(time.time())
+
+    def invalidate(self, context: dict = None):
+        """Forget one scope's answers, or everything."""
+        with self._lock:
+            if context is None:
+                self._scopes.clear()
+            else:
+                self._scopes.pop(self.scope_of(context), None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "scopes": len(self._scopes),
+                "entries": sum(len(entry["answers"]) for entry in self._scopes.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
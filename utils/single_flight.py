@@ -0,0 +1,95 @@
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Request coalescing: while a call for a key is in flight, further calls
+    with the same key wait for it and receive its result (or exception)
+    instead of starting their own. Works for threads (do) and asyncio
+    tasks (ado). Counters report how many calls were deduplicated.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}          # key -> _Call
+        self._futures = {}        # (loop, key) -> asyncio.Future
+        self.executed = 0
+        self.deduplicated = 0
+
+    def do(self, key: str, fn):
+        """Run fn() once per key among concurrent callers and share the outcome."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: str, coro_fn):
+        """Await coro_fn() once per key among concurrent tasks on this event loop and share the outcome."""
+        loop = asyncio.get_running_loop()
+        slot = (loop, key)
+        with self._lock:
+            future = self._futures.get(slot)
+            leader = future is None
+            if leader:
+                future = self._futures[slot] = loop.create_future()
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            # shield: a cancelled follower must not cancel the shared call
+            return await asyncio.shield(future)
+
+        try:
+            result = await coro_fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved so asyncio doesn't warn when nobody was waiting
+            raise
+        finally:
+            with self._lock:
+                del self._futures[slot]
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.executed + self.deduplicated
+            return {
+                "executed": self.executed,
+                "deduplicated": self.deduplicated,
+                "in_flight": len(self._calls) + len(self._futures),
+                "dedup_rate": self.deduplicated / total if total else 0.0,
+            }